@@ -1,20 +1,39 @@
 from contextlib import suppress
 
 from pytest_approval.main import (
+    approval_scope,
     verify,
+    verify_async,
     verify_binary,
+    verify_binary_async,
     verify_image,
+    verify_image_async,
     verify_json,
+    verify_json_async,
+    verify_stream,
+)
+from pytest_approval.scrub import (
+    compose_scrubbers,
+    get_all_datetimes_scrubber,
+    get_datetime_scrubber,
+    get_uuid_scrubber,
 )
-from pytest_approval.scrub import get_datetime_scrubber, get_uuid_scrubber
 
 __all__ = (
+    "approval_scope",
+    "compose_scrubbers",
+    "get_all_datetimes_scrubber",
     "get_datetime_scrubber",
     "get_uuid_scrubber",
     "verify",
+    "verify_async",
     "verify_binary",
+    "verify_binary_async",
     "verify_image",
+    "verify_image_async",
     "verify_json",
+    "verify_json_async",
+    "verify_stream",
 )
 
 
@@ -0,0 +1,147 @@
+"""Canonicalization of JSON serializable data before verification.
+
+Data is walked iteratively (no recursion limit) and never modified. Containers
+are only copied if their content changes, unchanged parts are shared with the
+input. Data referencing itself raises a ValueError like `json.dumps` does.
+
+Arrays (and sets) are sorted by value if their elements are comparable,
+otherwise by their canonical JSON text. Keys of objects are sorted by the JSON
+encoder (see `main._serialize_json`).
+"""
+
+import json
+from typing import Any, Iterator
+
+CONTAINERS = (dict, list, tuple, set, frozenset)
+SETS = (set, frozenset)
+# values which are never changed
+SCALARS = frozenset((str, int, bool, type(None)))
+
+
+def canonicalize(
+    data: Any,
+    *,
+    sort_arrays: bool = False,
+    precision: int | None = None,
+) -> Any:
+    """Get canonical form of data without modifying it.
+
+    Args:
+        sort_arrays: Sort elements of all arrays (for arrays with no meaningful
+            order).
+        precision: Round floats to given number of decimals.
+
+    Raises:
+        ValueError: If data contains a circular reference.
+    """
+    if not sort_arrays and precision is None:
+        return data  # sets are converted by the encoder (see `default`)
+    if not isinstance(data, CONTAINERS):
+        return _round(data, precision)
+    _check_circular(data)
+    # Collect all containers breadth first. Container children of a container
+    # follow each other, starting at index `first[i]`.
+    nodes = [data]
+    first = []
+    for node in nodes:
+        first.append(len(nodes))
+        values = node.values() if isinstance(node, dict) else node
+        nodes.extend(v for v in values if isinstance(v, CONTAINERS))
+    # Build canonical containers bottom up
+    results = [None] * len(nodes)
+    for i in reversed(range(len(nodes))):
+        results[i] = _canonicalize_node(
+            nodes[i], results, first[i], sort_arrays, precision
+        )
+    return results[0]
+
+
+def _canonicalize_node(
+    node: Any,
+    results: list,
+    child: int,
+    sort_arrays: bool,
+    precision: int | None,
+) -> Any:
+    """Canonicalize container given canonical forms of its container children."""
+    values = node.values() if isinstance(node, dict) else node
+    changed = isinstance(node, SETS)
+    new = []
+    for value in values:
+        cls = type(value)
+        if cls in SCALARS:
+            new_value = value
+        elif isinstance(value, CONTAINERS):
+            new_value = results[child]
+            results[child] = None  # release early
+            child += 1
+        else:
+            new_value = _round(value, precision)
+        if new_value is not value:
+            changed = True
+        new.append(new_value)
+    if isinstance(node, dict):
+        return dict(zip(node, new, strict=True)) if changed else node
+    if sort_arrays or isinstance(node, SETS):
+        new = sort(new)
+        changed = changed or any(a is not b for a, b in zip(new, node, strict=True))
+    return new if changed else node
+
+
+def sort(values: list | tuple | set | frozenset) -> list:
+    """Sort values by value or, if not comparable, by canonical JSON text."""
+    try:
+        return sorted(values)
+    except TypeError:
+        return sorted(values, key=_sort_key)
+
+
+def default(value: Any) -> Any:
+    """Serialize sets as sorted arrays. Used as `default` of the JSON encoder."""
+    if isinstance(value, SETS):
+        return sort(value)
+    msg = f"Object of type {type(value).__name__} is not JSON serializable"
+    raise TypeError(msg)
+
+
+def _check_circular(data: Any):
+    """Raise ValueError if a container references itself.
+
+    Containers are walked depth first, each one once. Containers referenced
+    multiple times without a cycle are fine.
+    """
+    path = {id(data)}  # containers on the current path
+    done = set()  # containers checked completely
+    stack = [(data, _children(data))]
+    while stack:
+        node, children = stack[-1]
+        for child in children:
+            if id(child) in path:
+                msg = "Circular reference detected"
+                raise ValueError(msg)
+            if id(child) not in done:
+                path.add(id(child))
+                stack.append((child, _children(child)))
+                break
+        else:
+            stack.pop()
+            path.discard(id(node))
+            done.add(id(node))
+
+
+def _children(node: Any) -> Iterator:
+    """Iterate over container children of container."""
+    values = node.values() if isinstance(node, dict) else node
+    return (v for v in values if isinstance(v, CONTAINERS))
+
+
+def _round(value: Any, precision: int | None) -> Any:
+    """Round float. Value is kept as is if unchanged."""
+    if precision is None or not isinstance(value, float):
+        return value
+    rounded = round(value, precision)
+    return value if rounded == value else rounded
+
+
+def _sort_key(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, default=default)
@@ -1,20 +1,182 @@
 import filecmp
+import hashlib
 import logging
+import math
+import re
+from contextlib import ExitStack
+from functools import partial
+from importlib.util import find_spec
 from pathlib import Path
+from typing import Iterable, Sequence
 
+from pytest_approval import compress, index, json_diff, manifest
 from pytest_approval.definitions import BINARY_EXTENSIONS
+from pytest_approval.utils import normalize_newlines, split_tolerance
 
 logger = logging.getLogger(__name__)
 
+NUMPY_AVAILABLE = find_spec("numpy") is not None
+
+# Number of characters to read at once when comparing text files
+CHUNK_SIZE = 1024 * 1024
+# Float literal (with decimal point or exponent) which is not part of a word or
+# of a dotted number (e.g. a version). Integers are compared as text. The
+# leading lookahead makes scanning text without numbers faster.
+FLOAT = re.compile(
+    r"(?=[-+.\d])(?<![\w.])"
+    + r"([-+]?(?:\d+\.\d*|\.\d+|\d+(?=[eE]))(?:[eE][-+]?\d+)?)(?![\w.])"
+)
+
 
 def compare_files(received: Path, approved: Path) -> bool:
     logger.debug(f"Compare {received} with {approved}.")
-    if filecmp.cmp(received, approved, shallow=False):
-        return True
-    elif received.suffix not in BINARY_EXTENSIONS:
-        return approved.read_text() == received.read_text()
+    equal = _compare_digest(received, approved)
+    if equal is not None:
+        return equal
+    compressed = compress.find(approved)
+    if compressed is not None:
+        return compress.compare_file(received, compressed)
+    # Digest is computed while comparing to be recorded if both are equal
+    hash_ = manifest.new_hash() if manifest.is_tracked(approved) else None
+    if received.suffix in BINARY_EXTENSIONS:
+        equal = _compare_binary_files(received, approved, hash_)
     else:
+        equal = _compare_text_files(received, approved, hash_)
+    if equal and hash_ is not None:
+        manifest.record_digest(approved, hash_.hexdigest())
+    return equal
+
+
+def compare_contents(received: str | bytes, approved: Path) -> bool:
+    """Compare received contents in memory with approved file.
+
+    Text is compared with universal newlines like `compare_files` does.
+    """
+    logger.debug(f"Compare received contents with {approved}.")
+    entry = index.lookup(approved)
+    if entry is None:
+        compressed = compress.find(approved)
+        if compressed is None or isinstance(received, bytes):
+            return False
+        return compress.compare_contents(received, compressed)
+    equal = manifest.compare_digest(received, approved)
+    if equal is not None:
+        return equal
+    try:
+        if isinstance(received, bytes):
+            if entry.size != len(received):
+                return False
+            equal = approved.read_bytes() == received
+        else:
+            received = normalize_newlines(received)
+            equal = _compare_text(received, approved)
+    except FileNotFoundError:
+        index.discard(approved)
+        return False
+    if equal:
+        manifest.record(approved, received)
+    return equal
+
+
+def compare_stream(received: Iterable[str], approved: Path) -> bool:
+    """Compare stream of lines incrementally with approved file.
+
+    Text is compared with universal newlines like `compare_files` does. The stream
+    is always consumed completely, even if a difference has been found.
+    """
+    logger.debug(f"Compare received stream with {approved}.")
+    digest = manifest.lookup(approved)
+    hash_ = manifest.new_hash() if manifest.is_tracked(approved) else None
+    equal = True
+    with ExitStack() as stack:
+        file = None
+        if digest is None:
+            compressed = compress.find(approved)
+            if compressed is not None:
+                file = stack.enter_context(compress.open_text(compressed))
+            else:
+                file = stack.enter_context(open(approved))
+        for line in received:
+            line = normalize_newlines(line)
+            if hash_ is not None:
+                hash_.update(line.encode())
+            if equal and file is not None:
+                equal = file.read(len(line)) == line
+        if file is not None:
+            equal = equal and file.read(1) == ""
+    if hash_ is None:
+        return equal
+    if digest is not None:
+        equal = hash_.hexdigest() == digest
+    if equal:
+        manifest.record_digest(approved, hash_.hexdigest())
+    return equal
+
+
+def compare_files_within_tolerance(
+    received: Path,
+    approved: Path,
+    *,
+    tolerance: float | Sequence[float],
+) -> bool:
+    """Compare text files, but float numbers within tolerance.
+
+    Files are only tokenized if their text differs (see
+    `compare_text_within_tolerance`).
+    """
+    if compare_files(received, approved):
+        return True
+    if received.suffix in BINARY_EXTENSIONS:
+        return False
+    logger.debug(f"Compare {received} with {approved} within tolerance.")
+    return compare_text_within_tolerance(
+        received.read_text(), _read_text(approved), tolerance
+    )
+
+
+def compare_text_within_tolerance(
+    received: str,
+    approved: str,
+    tolerance: float | Sequence[float],
+) -> bool:
+    """Compare float literals within tolerance and all other text exactly.
+
+    Floats are equal if they are within relative or absolute tolerance of each
+    other (like `math.isclose`). A number is used as relative and absolute
+    tolerance, a pair as (relative, absolute) tolerance.
+    """
+    received_parts = FLOAT.split(received)
+    approved_parts = FLOAT.split(approved)
+    # Text between floats is at even, floats are at odd positions
+    if received_parts[::2] != approved_parts[::2]:
         return False
+    rel, abs_ = split_tolerance(tolerance)
+    return _all_close(received_parts[1::2], approved_parts[1::2], rel, abs_)
+
+
+def compare_json_files(
+    received: Path,
+    approved: Path,
+    *,
+    tolerance: float | Sequence[float] | None = None,
+) -> bool:
+    """Compare JSON files structurally, independent of formatting and key order.
+
+    Files are only parsed if their text differs. Floats are compared within
+    tolerance if given (see `compare_text_within_tolerance`).
+    """
+    if compare_files(received, approved):
+        return True
+    logger.debug(f"Compare {received} with {approved} structurally.")
+    try:
+        received_json = json_diff.load(received)
+        approved_json = json_diff.load(approved)
+    except (ValueError, FileNotFoundError):  # e.g. empty approved file
+        return False
+    difference = json_diff.first_difference(
+        received_json, approved_json, tolerance=tolerance
+    )
+    return difference is None
 
 
 def compare_files_shallow(received: Path, approved: Path) -> bool:
@@ -22,7 +184,7 @@ def compare_files_shallow(received: Path, approved: Path) -> bool:
     if filecmp.cmp(received, approved, shallow=True):
         return True
     elif received.suffix not in BINARY_EXTENSIONS:
-        return approved.read_text() == received.read_text()
+        return _compare_text_files(received, approved)
     else:
         return False
 
@@ -37,8 +199,100 @@ def compare_image_contents_only(received: Path, approved: Path) -> bool:
             'To use content_only, please install "pytest-approval[image]"'
             + '\n\n\tpip install "pytest-approval[image]"'
         ) from error
+    if _compare_digest(received, approved):
+        return True
     received_image = Image.open(received)
     approved_image = Image.open(approved)
     received_array = numpy.array(received_image)
     approved_array = numpy.array(approved_image)
     return numpy.array_equiv(received_array, approved_array)
+
+
+def _all_close(received: list[str], approved: list[str], rel: float, abs_: float):
+    """Compare floats given as text within tolerance.
+
+    Vectorized if numpy is installed.
+    """
+    if not NUMPY_AVAILABLE:
+        isclose = partial(math.isclose, rel_tol=rel, abs_tol=abs_)
+        return all(map(isclose, map(float, received), map(float, approved)))
+    import numpy
+
+    r = numpy.array(received, dtype=numpy.float64)
+    a = numpy.array(approved, dtype=numpy.float64)
+    with numpy.errstate(invalid="ignore"):  # difference of infinities
+        bound = numpy.maximum(rel * numpy.maximum(numpy.abs(r), numpy.abs(a)), abs_)
+        close = (numpy.abs(r - a) <= bound) & numpy.isfinite(r) & numpy.isfinite(a)
+    # Infinities are only equal to themselves (like `math.isclose`)
+    return bool(numpy.all((r == a) | close))
+
+
+def _compare_binary_files(
+    received: Path, approved: Path, hash_: hashlib.blake2b | None = None
+) -> bool:
+    """Compare files chunk by chunk.
+
+    Stops at the first differing chunk. Received is digested by hash_ on the way.
+    """
+    if received.stat().st_size != approved.stat().st_size:
+        return False
+    with open(received, "rb") as received_file, open(approved, "rb") as approved_file:
+        while True:
+            chunk = received_file.read(CHUNK_SIZE)
+            if hash_ is not None:
+                hash_.update(chunk)
+            if chunk != approved_file.read(CHUNK_SIZE):
+                return False
+            if not chunk:
+                return True
+
+
+def _compare_text_files(
+    received: Path, approved: Path, hash_: hashlib.blake2b | None = None
+) -> bool:
+    """Compare text files chunk by chunk with universal newlines.
+
+    Stops at the first differing chunk. Received is digested by hash_ on the way.
+    """
+    with open(received) as received_file, open(approved) as approved_file:
+        while True:
+            chunk = received_file.read(CHUNK_SIZE)
+            if hash_ is not None:
+                hash_.update(chunk.encode())
+            if chunk != approved_file.read(CHUNK_SIZE):
+                return False
+            if not chunk:
+                return True
+
+
+def _compare_text(received: str, approved: Path) -> bool:
+    """Compare text with text file chunk by chunk with universal newlines."""
+    with open(approved) as file:
+        for start in range(0, len(received), CHUNK_SIZE):
+            if file.read(CHUNK_SIZE) != received[start : start + CHUNK_SIZE]:
+                return False
+        return file.read(1) == ""
+
+
+def _compare_digest(received: Path, approved: Path) -> bool | None:
+    """Compare digest of received file with digest of approved from the manifest.
+
+    Returns None if digest of approved is unknown.
+    """
+    digest = manifest.lookup(approved)
+    if digest is None:
+        return None
+    return manifest.digest(_read(received)) == digest
+
+
+def _read_text(path: Path) -> str:
+    """Read text file, which might be stored compressed."""
+    compressed = compress.find(path)
+    with compress.open_text(compressed) if compressed else open(path) as file:
+        return file.read()
+
+
+def _read(path: Path) -> str | bytes:
+    if path.suffix in BINARY_EXTENSIONS:
+        return path.read_bytes()
+    return path.read_text()
@@ -0,0 +1,140 @@
+"""Compression of large approved text files.
+
+Approved text files larger than a threshold are stored compressed next to where
+the approved file would be (e.g. `test_foo.py--test_bar.approved.json.gz`).
+Received output is compared with a compressed approved file by streaming
+decompression. Only if a difference needs to be reported, the approved file is
+decompressed to disk.
+
+Approved files which have been written during the session (by decompression,
+approval or auto approval) are compressed again and removed at the end of the
+session (see plugin.py). Compressed approved files are read regardless of
+configuration.
+"""
+
+import gzip
+import logging
+import shutil
+import sys
+from pathlib import Path
+from typing import IO
+
+from pytest_approval import index, pack
+from pytest_approval.definitions import BINARY_EXTENSIONS
+from pytest_approval.utils import normalize_newlines, open_atomic
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {"gzip": ".gz", "zstd": ".zst"}
+ZSTD_AVAILABLE = sys.version_info >= (3, 14)  # compression.zstd
+# Number of characters to read at once when comparing
+CHUNK_SIZE = 1024 * 1024
+
+# will be instantiated during pytest configuration by plugin.py
+FORMAT: str | None = None  # None if compression is disabled
+THRESHOLD: int = 1024 * 1024  # size in bytes from which on to compress
+# approved files written to disk during the session
+WRITTEN: set[Path] = set()
+
+
+def find(approved: Path) -> Path | None:
+    """Find compressed approved file if approved does not exist uncompressed."""
+    if approved.suffix in BINARY_EXTENSIONS or index.exists(approved):
+        return None
+    for suffix in FORMATS.values():
+        path = approved.with_name(approved.name + suffix)
+        if index.exists(path):
+            return path
+    return None
+
+
+def compare_contents(received: str, compressed: Path) -> bool:
+    """Compare received text with compressed approved text file."""
+    received = normalize_newlines(received)
+    with open_text(compressed) as file:
+        for start in range(0, len(received), CHUNK_SIZE):
+            if file.read(CHUNK_SIZE) != received[start : start + CHUNK_SIZE]:
+                return False
+        return file.read(1) == ""
+
+
+def compare_file(received: Path, compressed: Path) -> bool:
+    """Compare received text file with compressed approved text file."""
+    with open(received) as received_file, open_text(compressed) as approved_file:
+        while True:
+            chunk = received_file.read(CHUNK_SIZE)
+            if chunk != approved_file.read(CHUNK_SIZE):
+                return False
+            if not chunk:
+                return True
+
+
+def open_text(compressed: Path) -> IO[str]:
+    """Open compressed text file for reading with universal newlines."""
+    return _open(compressed, "rt")
+
+
+def decompress(approved: Path):
+    """Decompress approved to disk (e.g. to be shown by a reporter).
+
+    Approved is tracked in any case, since a reporter might change it.
+    """
+    compressed = find(approved)
+    if compressed is not None:
+        with _open(compressed, "rb") as source, open_atomic(approved, "wb") as file:
+            shutil.copyfileobj(source, file)
+        index.record(approved)
+    track(approved)
+
+
+def track(approved: Path):
+    """Track approved file written to disk to be compressed at session end."""
+    if approved.suffix not in BINARY_EXTENSIONS and not pack.is_packed(approved):
+        WRITTEN.add(approved)
+
+
+def absorb():
+    """Compress approved files written during the session if large enough.
+
+    Compressed files of approved files which are stored uncompressed are removed.
+    """
+    for approved in sorted(WRITTEN):
+        entry = index.record(approved)
+        if entry is None:
+            continue
+        stale = [approved.with_name(approved.name + s) for s in FORMATS.values()]
+        if FORMAT is not None and entry.size >= THRESHOLD:
+            compressed = approved.with_name(approved.name + FORMATS[FORMAT])
+            stale.remove(compressed)
+            _compress(approved, compressed)
+            approved.unlink()
+            index.discard(approved)
+        for path in stale:
+            path.unlink(missing_ok=True)
+            index.discard(path)
+    WRITTEN.clear()
+
+
+def _compress(approved: Path, compressed: Path):
+    with open(approved, "rb") as source, open_atomic(compressed, "wb") as file:
+        if compressed.suffix == FORMATS["zstd"]:
+            from compression import zstd
+
+            destination = zstd.ZstdFile(file, "wb")
+        else:
+            # Without timestamp, compressing the same content twice gives the same
+            # file (no changes for version control)
+            destination = gzip.GzipFile(fileobj=file, mode="wb", filename="", mtime=0)
+        with destination:
+            shutil.copyfileobj(source, destination)
+    index.record(compressed)
+    logger.debug(f"Compressed {approved}.")
+
+
+def _open(compressed: Path, mode: str) -> IO:
+    """Open compressed file. Format is determined by suffix."""
+    if compressed.suffix == FORMATS["zstd"]:
+        from compression import zstd
+
+        return zstd.open(compressed, mode)
+    return gzip.open(compressed, mode)
@@ -1,28 +1,49 @@
 import logging
 import tomllib
+from functools import lru_cache
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
 
 def _find_config(path: Path | None = None) -> Path | None:
-    """Recursively walk up to root from current working dir to find pyproject.toml"""
+    """Walk up to root from given path or current working dir to find pyproject.toml"""
     if path is None:
         path = Path.cwd()
-    if str(path) == path.root:
-        logger.debug("No pyproject.toml found.")
-        return None
-    config_path = path / "pyproject.toml"
-    if config_path.exists():
-        return config_path
-    else:
-        return _find_config(path.parent)
+    for directory in (path, *path.parents):
+        if str(directory) == directory.root:
+            break
+        config_path = directory / "pyproject.toml"
+        if config_path.exists():
+            return config_path
+    logger.debug("No pyproject.toml found.")
+    return None
+
 
+def _read_config(rootpath: Path | None = None, inipath: Path | None = None) -> dict:
+    """Read configuration table from pyproject.toml.
 
-def _read_config() -> dict:
-    path = _find_config()
+    Pytest's configuration file (inipath) is used if it is a pyproject.toml.
+    Otherwise pyproject.toml is searched starting from pytest's rootdir (rootpath)
+    or current working dir.
+
+    Parsed configuration is cached by path and modification time.
+    """
+    if inipath is not None and inipath.name == "pyproject.toml":
+        path = inipath
+    else:
+        path = _find_config(rootpath)
     if path is None:
         return {}
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    return dict(_parse_config(path, mtime_ns))
+
+
+@lru_cache
+def _parse_config(path: Path, mtime_ns: int) -> dict:
     with open(path, "rb") as file:
         config = tomllib.load(file)
     try:
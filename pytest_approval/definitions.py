@@ -1,7 +1,5 @@
 from pathlib import Path
 
-from pytest_approval.config import _read_config
-
 BASE_DIR = Path(__file__).parent.resolve()
 
 # Order matters: First working reporter is found by going through this list one-by-one
@@ -15,6 +13,8 @@ REPORTERS = {
             ]
         ],
         "binary": False,
+        # Arguments per pair of files to open all of them at once (optional)
+        "batch": ["--diff", "%received", "%approved"],
     },
     "pycharm": {
         "commands": [
@@ -189,7 +189,12 @@ BINARY_EXTENSIONS: list[str] = [
     # "zip",
 ]
 
-CONFIG = _read_config()
+# Default budget of the in-process diff reporter used in CI
+DIFF_MAX_HUNKS = 100
+DIFF_MAX_BYTES = 100_000
+
+# will be instantiated during pytest configuration by plugin.py
+CONFIG: dict = {}
 
 # with suppress(KeyError):
 #     REPORTERS = list(set(CONFIG["reporters"] + REPORTERS))
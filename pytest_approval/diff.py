@@ -0,0 +1,353 @@
+"""In-process unified diff used as reporter in continuous integration environments.
+
+Output is the same as of `diff --unified --label received --label approved`.
+
+Lines are matched with a histogram diff: After stripping common prefix and suffix
+of a region, a line of approved occurring least often in the region of received
+is used as anchor, preferring lines close to the middle of the region. The match
+around the anchor is extended in both directions and the regions before and after
+are diffed the same way. The work is limited to a multiple of the number of lines
+(see `WORK_PER_LINE`).
+"""
+
+from bisect import bisect_left
+from collections import Counter
+from itertools import zip_longest
+from pathlib import Path
+from typing import Callable, Iterator
+
+RESET = "\033[0m"
+BOLD = "\033[1m"
+RED = "\033[31m"
+GREEN = "\033[32m"
+CYAN = "\033[36m"
+
+# Number of lines compared at once when stripping common prefix and suffix
+BLOCK_SIZE = 1024
+# Number of lines examined for anchors per line of both files. Limits the work
+# on repetitive input: Once used up, remaining regions are replaced as a whole.
+WORK_PER_LINE = 8
+# Number of lines examined for an anchor occurring less often than the first found
+MAX_CANDIDATES = 64
+
+Opcode = tuple[str, int, int, int, int]
+
+
+def unified_diff(
+    received: Path,
+    approved: Path,
+    *,
+    context: int = 3,
+    max_hunks: int | None = None,
+    max_bytes: int | None = None,
+    color: bool = False,
+) -> str:
+    """Compute unified diff of two files. Empty if both files are equal.
+
+    Args:
+        max_hunks: Maximum number of hunks to show.
+        max_bytes: Maximum number of characters to show (approximately).
+        color: Color output using ANSI escape sequences.
+    """
+    a = _read_lines(received)
+    b = _read_lines(approved)
+    groups = _group_opcodes(_opcodes(a, b), context)
+    if not groups:
+        return ""
+
+    def style(text: str, code: str) -> str:
+        return f"{code}{text}{RESET}" if color else text
+
+    output = [
+        style("--- received", BOLD) + "\n",
+        style("+++ approved", BOLD) + "\n",
+    ]
+    size = sum(len(line) for line in output)
+    for count, group in enumerate(groups):
+        if max_hunks is not None and count >= max_hunks:
+            output.append(f"... {len(groups) - count} more hunk(s) not shown\n")
+            return "".join(output)
+        for line in _format_hunk(group, a, b, style):
+            if max_bytes is not None and size + len(line) > max_bytes:
+                output.append(f"... diff truncated after {size} bytes\n")
+                return "".join(output)
+            size += len(line)
+            output.append(line)
+    return "".join(output)
+
+
+def _read_lines(path: Path) -> list[str]:
+    """Read lines split at and including newline characters only."""
+    with open(path, encoding="utf-8", errors="surrogateescape", newline="\n") as file:
+        return file.readlines()
+
+
+def _opcodes(a: list[str], b: list[str]) -> list[Opcode]:
+    """Compute opcodes like `difflib.SequenceMatcher.get_opcodes`."""
+    matches = []  # matching blocks: start in a, start in b, length
+    index = _Index(a, budget=WORK_PER_LINE * (len(a) + len(b)))
+    stack = [(0, len(a), 0, len(b))]
+    while stack:
+        alo, ahi, blo, bhi = stack.pop()
+        prefix = _common_prefix(a, alo, ahi, b, blo, bhi)
+        if prefix:
+            matches.append((alo, blo, prefix))
+            alo += prefix
+            blo += prefix
+        suffix = _common_suffix(a, alo, ahi, b, blo, bhi)
+        if suffix:
+            matches.append((ahi - suffix, bhi - suffix, suffix))
+            ahi -= suffix
+            bhi -= suffix
+        if alo == ahi or blo == bhi:
+            continue
+        anchor = _find_anchor(index, alo, ahi, b, blo, bhi)
+        if anchor is None:  # region is replaced
+            continue
+        i1, i2, j1, j2 = _extend_match(a, b, *anchor, alo, ahi, blo, bhi)
+        matches.append((i1, j1, i2 - i1))
+        stack.append((alo, i1, blo, j1))
+        stack.append((i2, ahi, j2, bhi))
+    return _to_opcodes(sorted(matches), len(a), len(b))
+
+
+def _to_opcodes(
+    matches: list[tuple[int, int, int]],
+    a_length: int,
+    b_length: int,
+) -> list[Opcode]:
+    opcodes = []
+    i = j = 0
+    for ai, bj, size in [*matches, (a_length, b_length, 0)]:
+        if i < ai and j < bj:
+            opcodes.append(("replace", i, ai, j, bj))
+        elif i < ai:
+            opcodes.append(("delete", i, ai, j, bj))
+        elif j < bj:
+            opcodes.append(("insert", i, ai, j, bj))
+        if size:
+            opcodes.append(("equal", ai, ai + size, bj, bj + size))
+        i, j = ai + size, bj + size
+    return opcodes
+
+
+def _common_prefix(
+    a: list[str],
+    alo: int,
+    ahi: int,
+    b: list[str],
+    blo: int,
+    bhi: int,
+) -> int:
+    n = min(ahi - alo, bhi - blo)
+    k = 0
+    # Compare blocks of lines at C speed first
+    while k + BLOCK_SIZE <= n and (
+        a[alo + k : alo + k + BLOCK_SIZE] == b[blo + k : blo + k + BLOCK_SIZE]
+    ):
+        k += BLOCK_SIZE
+    while k < n and a[alo + k] == b[blo + k]:
+        k += 1
+    return k
+
+
+def _common_suffix(
+    a: list[str],
+    alo: int,
+    ahi: int,
+    b: list[str],
+    blo: int,
+    bhi: int,
+) -> int:
+    n = min(ahi - alo, bhi - blo)
+    k = 0
+    while k + BLOCK_SIZE <= n and (
+        a[ahi - k - BLOCK_SIZE : ahi - k] == b[bhi - k - BLOCK_SIZE : bhi - k]
+    ):
+        k += BLOCK_SIZE
+    while k < n and a[ahi - k - 1] == b[bhi - k - 1]:
+        k += 1
+    return k
+
+
+class _Index:
+    """Occurrences of lines of a, shared by all regions of a diff.
+
+    Lines are hashed and counted once for the whole file. Positions of lines are
+    only indexed if needed (e.g. for moved or repeated lines). The budget limits
+    the number of lines of b examined for anchors.
+    """
+
+    __slots__ = ("a", "budget", "counts", "positions")
+
+    def __init__(self, a: list[str], budget: int):
+        self.a = a
+        self.budget = budget
+        self.counts = Counter(a)
+        self.positions: dict[str, list[int]] | None = None
+
+    def occurrences(self, line: str) -> list[int]:
+        if self.positions is None:
+            self.positions = {}
+            for i, k in enumerate(self.a):
+                self.positions.setdefault(k, []).append(i)
+        return self.positions[line]
+
+
+def _find_anchor(
+    index: _Index,
+    alo: int,
+    ahi: int,
+    b: list[str],
+    blo: int,
+    bhi: int,
+) -> tuple[int, int] | None:
+    """Find line of b occurring least often in region of a, close to the middle.
+
+    Lines of b are examined from the middle outwards, so that regions are split
+    evenly. Of the occurrences in a the one closest to the corresponding position
+    is used. Lines occurring once in whole a are searched in the region of a
+    without indexing positions. None if there is no anchor or the budget is used
+    up.
+    """
+    best = None  # count in region, line of b, range of occurrences in a
+    examined = 0
+    for j in _middle_out(blo, bhi):
+        if index.budget <= 0 or examined > MAX_CANDIDATES:
+            break
+        index.budget -= 1
+        if best is not None:
+            examined += 1
+        line = b[j]
+        total = index.counts.get(line, 0)
+        if total == 0:
+            continue
+        if total == 1 and index.positions is None:
+            try:
+                return index.a.index(line, alo, ahi), j
+            except ValueError:  # line is outside of region: index positions
+                pass
+        occurrences = index.occurrences(line)
+        lo = bisect_left(occurrences, alo)
+        hi = bisect_left(occurrences, ahi, lo)
+        if lo < hi and (best is None or hi - lo < best[0]):
+            best = (hi - lo, j, lo, hi)
+            if hi - lo == 1:
+                break
+    if best is None:
+        return None
+    _, j, lo, hi = best
+    target = alo + (j - blo) * (ahi - alo) // (bhi - blo)
+    return _closest(index.occurrences(b[j]), target, lo, hi), j
+
+
+def _closest(occurrences: list[int], target: int, lo: int, hi: int) -> int:
+    """Get occurrence closest to target within range of occurrences."""
+    k = bisect_left(occurrences, target, lo, hi)
+    if k == hi or (k > lo and target - occurrences[k - 1] < occurrences[k] - target):
+        k -= 1
+    return occurrences[k]
+
+
+def _middle_out(lo: int, hi: int) -> Iterator[int]:
+    """Yield indices from the middle of range outwards, alternating sides."""
+    middle = (lo + hi) // 2
+    for pair in zip_longest(range(middle, hi), range(middle - 1, lo - 1, -1)):
+        for j in pair:
+            if j is not None:
+                yield j
+
+
+def _extend_match(
+    a: list[str],
+    b: list[str],
+    i: int,
+    j: int,
+    alo: int,
+    ahi: int,
+    blo: int,
+    bhi: int,
+) -> tuple[int, int, int, int]:
+    """Extend match of line i in a and line j in b in both directions."""
+    before = _common_suffix(a, alo, i, b, blo, j)
+    after = _common_prefix(a, i + 1, ahi, b, j + 1, bhi)
+    return i - before, i + 1 + after, j - before, j + 1 + after
+
+
+def _group_opcodes(opcodes: list[Opcode], context: int) -> list[list[Opcode]]:
+    """Group opcodes into hunks like `difflib.SequenceMatcher.get_grouped_opcodes`."""
+    if not opcodes or (len(opcodes) == 1 and opcodes[0][0] == "equal"):
+        return []
+    opcodes = list(opcodes)
+    # Fix leading and trailing context
+    tag, i1, i2, j1, j2 = opcodes[0]
+    if tag == "equal":
+        opcodes[0] = tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2
+    tag, i1, i2, j1, j2 = opcodes[-1]
+    if tag == "equal":
+        opcodes[-1] = tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)
+
+    groups = []
+    group = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        # End current group and start a new one if there is a large equal range
+        if tag == "equal" and i2 - i1 > context * 2:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            groups.append(group)
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        groups.append(group)
+    return groups
+
+
+def _format_hunk(
+    group: list[Opcode],
+    a: list[str],
+    b: list[str],
+    style: Callable[[str, str], str],
+) -> list[str]:
+    lines = [style(_format_hunk_header(group), CYAN) + "\n"]
+    for tag, i1, i2, j1, j2 in group:
+        if tag == "equal":
+            lines.extend(_format_lines(" ", a[i1:i2], style, ""))
+            continue
+        if tag in ("replace", "delete"):
+            lines.extend(_format_lines("-", a[i1:i2], style, RED))
+        if tag in ("replace", "insert"):
+            lines.extend(_format_lines("+", b[j1:j2], style, GREEN))
+    return lines
+
+
+def _format_hunk_header(group: list[Opcode]) -> str:
+    first, last = group[0], group[-1]
+    a_range = _format_range(first[1], last[2])
+    b_range = _format_range(first[3], last[4])
+    return f"@@ -{a_range} +{b_range} @@"
+
+
+def _format_range(start: int, stop: int) -> str:
+    """Format range like GNU diff does in unified format."""
+    beginning = start + 1  # lines start numbering with one
+    length = stop - start
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1  # empty ranges begin at line just before the range
+    return f"{beginning},{length}"
+
+
+def _format_lines(
+    prefix: str,
+    lines: list[str],
+    style: Callable[[str, str], str],
+    code: str,
+) -> list[str]:
+    formatted = []
+    for line in lines:
+        text = prefix + line.removesuffix("\n")
+        formatted.append((style(text, code) if code else text) + "\n")
+        if not line.endswith("\n"):
+            formatted.append("\\ No newline at end of file\n")
+    return formatted
@@ -0,0 +1,100 @@
+"""Session-wide index of the approvals directory.
+
+The index is built once during pytest configuration by plugin.py and kept
+up-to-date while files are written. It saves filesystem round trips (`stat`,
+`exists`, `mkdir`) on every verification.
+
+Paths outside of the indexed directory and paths not found in the index are
+looked up on the filesystem.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+
+class Entry(NamedTuple):
+    size: int
+    mtime_ns: int
+
+
+ROOT: Path | None = None
+FILES: dict[Path, Entry] = {}
+DIRECTORIES: set[Path] = set()
+
+
+def build(directory: Path) -> None:
+    """Index all files and directories of given directory in a single walk."""
+    global ROOT
+    ROOT = Path(directory)
+    FILES.clear()
+    DIRECTORIES.clear()
+    stack = [ROOT]
+    while stack:
+        path = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                DIRECTORIES.add(path)
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(Path(entry.path))
+                    elif entry.is_file():
+                        stat = entry.stat()
+                        FILES[Path(entry.path)] = Entry(stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            continue
+    logger.debug(f"Indexed {len(FILES)} files in {ROOT}.")
+
+
+def clear() -> None:
+    global ROOT
+    ROOT = None
+    FILES.clear()
+    DIRECTORIES.clear()
+
+
+def lookup(path: Path) -> Entry | None:
+    """Get size and modification time of file or None if file does not exist."""
+    if _is_indexed(path):
+        entry = FILES.get(path)
+        if entry is not None:
+            return entry
+    # File is not indexed or might have been created outside of pytest-approval
+    return record(path)
+
+
+def exists(path: Path) -> bool:
+    return lookup(path) is not None
+
+
+def record(path: Path) -> Entry | None:
+    """Read size and modification time of file from disk and update index."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        discard(path)
+        return None
+    entry = Entry(stat.st_size, stat.st_mtime_ns)
+    if _is_indexed(path):
+        FILES[path] = entry
+    return entry
+
+
+def discard(path: Path) -> None:
+    FILES.pop(path, None)
+
+
+def mkdir(path: Path) -> None:
+    """Create directory (and parents) if not in index."""
+    if path in DIRECTORIES:
+        return
+    path.mkdir(exist_ok=True, parents=True)
+    if _is_indexed(path):
+        DIRECTORIES.add(path)
+
+
+def _is_indexed(path: Path) -> bool:
+    return ROOT is not None and path.is_relative_to(ROOT)
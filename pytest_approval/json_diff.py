@@ -0,0 +1,120 @@
+"""Structural comparison of JSON documents and diff by JSON pointer.
+
+Both documents are walked side by side (iteratively, without recursion limit).
+Differences are yielded in document order, so that comparison can stop at the
+first difference. Objects are compared independent of key order. Numbers are
+compared by value (`1` equals `1.0`), but booleans are not numbers.
+
+A difference is formatted as JSON pointer (RFC 6901) with the value in received
+and approved:
+
+    /features/1042/properties/area: 12.5 -> 12.6
+    /features/1043: (missing) -> {"type": "Feature"}
+"""
+
+import json
+import math
+from itertools import zip_longest
+from pathlib import Path
+from typing import Any, Iterator, Sequence
+
+from pytest_approval import compress
+from pytest_approval.utils import split_tolerance
+
+# Placeholder for a value which does not exist in one of the documents
+MISSING = object()
+# Maximum number of characters of a formatted value
+MAX_VALUE_LENGTH = 80
+
+
+def differences(
+    received: Any,
+    approved: Any,
+    *,
+    tolerance: float | Sequence[float] | None = None,
+) -> Iterator[tuple[str, Any, Any]]:
+    """Yield JSON pointer, received and approved value of differences.
+
+    Args:
+        tolerance: Compare floats within relative and absolute tolerance (see
+            `compare.compare_text_within_tolerance`).
+    """
+    tolerances = None if tolerance is None else split_tolerance(tolerance)
+    stack = [("", received, approved)]
+    while stack:
+        pointer, r, a = stack.pop()
+        if isinstance(r, dict) and isinstance(a, dict):
+            children = [(k, r.get(k, MISSING), a.get(k, MISSING)) for k in r]
+            children += [(k, MISSING, a[k]) for k in a if k not in r]
+        elif isinstance(r, list) and isinstance(a, list):
+            pairs = zip_longest(r, a, fillvalue=MISSING)
+            children = [(str(i), *pair) for i, pair in enumerate(pairs)]
+        else:
+            if not _equal(r, a, tolerances):
+                yield pointer, r, a
+            continue
+        # Children are popped from the stack in document order
+        for key, r_child, a_child in reversed(children):
+            stack.append((pointer + "/" + _escape(key), r_child, a_child))
+
+
+def first_difference(
+    received: Any,
+    approved: Any,
+    *,
+    tolerance: float | Sequence[float] | None = None,
+) -> tuple[str, Any, Any] | None:
+    return next(differences(received, approved, tolerance=tolerance), None)
+
+
+def pointer_diff(
+    received: Any,
+    approved: Any,
+    *,
+    max_differences: int | None = None,
+    tolerance: float | Sequence[float] | None = None,
+) -> str:
+    """Format differences of two JSON documents. Empty if both are equal."""
+    output = []
+    found = differences(received, approved, tolerance=tolerance)
+    for count, (pointer, r, a) in enumerate(found):
+        if max_differences is not None and count >= max_differences:
+            output.append("... more differences not shown\n")
+            break
+        output.append(f"{pointer or '/'}: {_format(r)} -> {_format(a)}\n")
+    if not output:
+        return ""
+    return "--- received\n+++ approved\n" + "".join(output)
+
+
+def load(path: Path) -> Any:
+    """Load JSON file, which might be stored compressed."""
+    compressed = compress.find(path)
+    with compress.open_text(compressed) if compressed else open(path) as file:
+        return json.load(file)
+
+
+def _equal(r: Any, a: Any, tolerances: tuple[float, float] | None = None) -> bool:
+    if isinstance(r, bool) or isinstance(a, bool):
+        return r is a
+    if isinstance(r, float) and isinstance(a, float) and math.isnan(r):
+        return math.isnan(a)
+    if isinstance(r, (int, float)) and isinstance(a, (int, float)):
+        if tolerances is not None and (isinstance(r, float) or isinstance(a, float)):
+            rel, abs_ = tolerances
+            return math.isclose(r, a, rel_tol=rel, abs_tol=abs_)
+        return r == a
+    return type(r) is type(a) and r == a
+
+
+def _escape(key: str) -> str:
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+def _format(value: Any) -> str:
+    if value is MISSING:
+        return "(missing)"
+    text = json.dumps(value)
+    if len(text) > MAX_VALUE_LENGTH:
+        return text[: MAX_VALUE_LENGTH - 3] + "..."
+    return text
@@ -0,0 +1,169 @@
+"""Scrubbing of JSON serializable data selected by JSONPath expressions.
+
+Supported is a subset of JSONPath:
+
+    $                 root
+    .name ['name']    member of object
+    [0] [-1]          element of array
+    .* [*]            all members or elements
+    ..name ..[0] ..*  recursive descent
+
+All paths are matched in a single traversal of the data. Only branches which
+can still match are traversed. The data is not modified: Objects and arrays on
+the way to a replaced value are copied, everything else is shared with the
+input. Paths are compiled once and cached.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, NamedTuple
+
+WILDCARD = object()
+CONTAINERS = (dict, list, tuple)
+
+
+class InvalidPathError(ValueError):
+    def __init__(self, path: str, position: int):
+        super().__init__(f"Invalid JSON path '{path}' at position {position}.")
+
+
+class Step(NamedTuple):
+    key: Any  # member name, array index or WILDCARD
+    descendant: bool = False  # match at any depth (recursive descent)
+
+
+_TOKEN = re.compile(
+    r"""(?P<dots>\.\.?)(?:(?P<star>\*)|(?P<name>[^.\[\]]+))?"""
+    + r"""|\[(?:(?P<bstar>\*)|(?P<index>-?\d+)|'(?P<sq>[^']*)'|"(?P<dq>[^"]*)")\]"""
+)
+
+
+@lru_cache(maxsize=1024)
+def compile_path(path: str) -> tuple[Step, ...]:
+    if not path.startswith("$"):
+        raise InvalidPathError(path, 0)
+    steps = []
+    position = 1
+    descendant = False
+    while position < len(path):
+        match = _TOKEN.match(path, position)
+        if match is None:
+            raise InvalidPathError(path, position)
+        position = match.end()
+        groups = match.groupdict()
+        if groups["dots"] is None:
+            steps.append(Step(_bracket_key(groups), descendant))
+        elif descendant:  # `..` must be followed by brackets
+            raise InvalidPathError(path, match.start())
+        elif groups["star"] is None and groups["name"] is None:
+            # `..` followed by brackets: `..[0]`
+            if groups["dots"] != "..":
+                raise InvalidPathError(path, match.start())
+            descendant = True
+            continue
+        else:
+            key = WILDCARD if groups["star"] else groups["name"]
+            steps.append(Step(key, groups["dots"] == ".."))
+        descendant = False
+    if descendant:
+        raise InvalidPathError(path, len(path))
+    return tuple(steps)
+
+
+def scrub(data: Any, paths: dict[str, Any]) -> Any:
+    """Replace values selected by JSONPath expressions.
+
+    Args:
+        paths: Maps JSONPath expression to replacement. A callable is called
+            with the selected value (e.g. a scrubber of `pytest_approval.scrub`
+            for string values). Any other replacement is used as value.
+    """
+    selectors = tuple(compile_path(path) for path in paths)
+    replacements = tuple(paths.values())
+    states = frozenset((i, 0) for i in range(len(selectors)))
+    for i, steps in enumerate(selectors):
+        if not steps:  # `$`
+            return _replace(data, replacements[i])
+    if not isinstance(data, CONTAINERS):
+        return data
+    stack = [_Frame(data, None, states)]
+    while True:
+        frame = stack[-1]
+        for key, value in frame.items:
+            states, matched = _advance(frame, key, selectors)
+            if matched is not None:
+                frame.changes[key] = _replace(value, replacements[matched])
+            elif states and isinstance(value, CONTAINERS):
+                stack.append(_Frame(value, key, states))
+                break
+        else:
+            stack.pop()
+            result = frame.result()
+            if not stack:
+                return result
+            if result is not frame.node:
+                stack[-1].changes[frame.key] = result
+
+
+class _Frame:
+    """Object or array being traversed with the states of paths matching it."""
+
+    __slots__ = ("changes", "items", "key", "node", "states")
+
+    def __init__(self, node: dict | list | tuple, key: Any, states: frozenset):
+        self.node = node
+        self.key = key  # key of node in its parent
+        self.states = states  # index of path and of its next step
+        self.items = iter(node.items()) if isinstance(node, dict) else enumerate(node)
+        self.changes = {}
+
+    def result(self) -> dict | list | tuple:
+        if not self.changes:
+            return self.node
+        result = dict(self.node) if isinstance(self.node, dict) else list(self.node)
+        for key, value in self.changes.items():
+            result[key] = value
+        return result
+
+
+def _advance(
+    frame: _Frame, key: Any, selectors: tuple[tuple[Step, ...], ...]
+) -> tuple[frozenset, int | None]:
+    """Get states of paths for child at key and index of first path matched."""
+    states = set()
+    matched = None
+    for i, position in frame.states:
+        step = selectors[i][position]
+        if step.descendant:
+            states.add((i, position))
+        if not _matches(step.key, key, frame.node):
+            continue
+        if position + 1 == len(selectors[i]):
+            matched = i if matched is None else min(i, matched)
+        else:
+            states.add((i, position + 1))
+    return frozenset(states), matched
+
+
+def _matches(step_key: Any, key: Any, node: dict | list | tuple) -> bool:
+    if step_key is WILDCARD:
+        return True
+    if isinstance(node, dict):
+        return step_key == key
+    if not isinstance(step_key, int):
+        return False
+    return step_key == key or step_key + len(node) == key
+
+
+def _replace(value: Any, replacement: Any) -> Any:
+    if callable(replacement):
+        return replacement(value)
+    return replacement
+
+
+def _bracket_key(groups: dict[str, str | None]) -> Any:
+    if groups["bstar"] is not None:
+        return WILDCARD
+    if groups["index"] is not None:
+        return int(groups["index"])
+    return groups["sq"] if groups["sq"] is not None else groups["dq"]
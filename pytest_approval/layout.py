@@ -0,0 +1,70 @@
+"""Layout of approval files in the approvals directory.
+
+Approval files are named after the pytest node ID, with `--` in place of `::`:
+
+- flat (default): `approvals/test_foo.py--test_bar.approved.txt`
+- per-module: `approvals/test_foo.py/test_bar.approved.txt`
+
+Paths are always generated in flat layout and then moved to the configured
+layout.
+"""
+
+import logging
+from pathlib import Path
+
+from pytest_approval import definitions
+
+logger = logging.getLogger(__name__)
+
+FLAT = "flat"
+PER_MODULE = "per-module"
+LAYOUTS = (FLAT, PER_MODULE)
+
+SEPARATOR = "--"
+
+
+def get_layout() -> str:
+    return definitions.CONFIG.get("approvals-layout", FLAT)
+
+
+def apply(path: Path, layout: str | None = None) -> Path:
+    """Move path in flat layout to given (default: configured) layout."""
+    layout = layout or get_layout()
+    if layout == PER_MODULE and SEPARATOR in path.name:
+        module, name = path.name.split(SEPARATOR, maxsplit=1)
+        return path.parent / module / name
+    return path
+
+
+def flatten(path: Path, layout: str | None = None) -> Path:
+    """Move path in given (default: configured) layout to flat layout."""
+    layout = layout or get_layout()
+    if layout == PER_MODULE and path.parent.suffix == ".py":
+        return path.parent.parent / (path.parent.name + SEPARATOR + path.name)
+    return path
+
+
+def migrate(directory: Path, layout: str) -> list[tuple[Path, Path]]:
+    """Move all approval files in directory to given layout.
+
+    Returns pairs of source and destination of moved files.
+    """
+    moved = []
+    for path in sorted(p for p in directory.rglob("*") if p.is_file()):
+        if path.name.startswith("."):  # e.g. manifest or temporary files
+            continue
+        destination = apply(flatten(path, PER_MODULE), layout)
+        if destination == path:
+            continue
+        if destination.exists():
+            logger.warning(f"Not moving {path}: {destination} exists.")
+            continue
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        path.rename(destination)
+        moved.append((path, destination))
+    # Remove module directories left empty
+    if layout == FLAT:
+        for path in sorted(directory.rglob("*"), reverse=True):
+            if path.suffix == ".py" and path.is_dir() and not any(path.iterdir()):
+                path.rmdir()
+    return moved
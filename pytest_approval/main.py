@@ -1,51 +1,87 @@
+import asyncio
+import hashlib
 import json
 import logging
 import os
+import re
 import shutil
+import socket
 import subprocess
-from glob import escape
+import sys
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+from importlib.util import find_spec
 from io import BytesIO
 from itertools import chain
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Callable, Literal
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterable, Iterator, Literal
 
 from pytest_nodeid_to_filepath import get_filepath
-from pytest_nodeid_to_filepath.main import FILEPATHS  # HACK
+from pytest_nodeid_to_filepath.main import count_duplicates
 
 if TYPE_CHECKING:
     # Always true for type checker. Always false during runtime.
     from PIL import Image
     from plotly.graph_objects import Figure
 
-try:
-    from PIL import Image
-
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
-
-
-try:
-    from plotly.graph_objects import Figure
-
-    PLOTLY_AVAILABLE = True
-except ImportError:
-    PLOTLY_AVAILABLE = False
-
-from pytest_approval.compare import compare_files, compare_image_contents_only
+from pytest_approval import (
+    canonical,
+    compress,
+    definitions,
+    index,
+    json_diff,
+    json_path,
+    layout,
+    orphans,
+    pack,
+)
+from pytest_approval.compare import (
+    CHUNK_SIZE,
+    compare_contents,
+    compare_files,
+    compare_files_within_tolerance,
+    compare_image_contents_only,
+    compare_json_files,
+    compare_stream,
+)
 from pytest_approval.definitions import (
     BASE_DIR,
     BINARY_EXTENSIONS,
+    DIFF_MAX_BYTES,
+    DIFF_MAX_HUNKS,
     REPORTERS,
 )
-from pytest_approval.utils import sort_dict
+from pytest_approval.diff import unified_diff
+from pytest_approval.utils import (
+    copy_atomic,
+    create_exclusive,
+    open_atomic,
+)
 
 logger = logging.getLogger(__name__)
 
+# Optional dependencies are only imported on first use. Importing Plotly takes
+# hundreds of milliseconds and this module is imported on every pytest run.
+PIL_AVAILABLE = find_spec("PIL") is not None
+PLOTLY_AVAILABLE = find_spec("plotly") is not None
+
 # will be instantiated during pytest configuration by plugin.py
 ROOT_DIR: str = ""
 APPROVALS_DIR: str = ""
 AUTO_APPROVE: bool = False
+REPORT_DEFERRED: bool = False
+# verifications to report at the end of the session: received, approved, compare
+DEFERRED_REPORTS: list[tuple[Path, Path, Callable]] = []
+# maps reporter cache key to working reporter command
+REPORTER_CACHE: dict[str, list[str]] = {}
+# name of current approval scope (see `approval_scope`)
+SCOPE: ContextVar[str | None] = ContextVar("approval_scope", default=None)
+# allocation of file paths counts calls to verify in a global list
+_FILEPATH_LOCK = threading.Lock()
+# reporters are run one after another, even if verify is called from many threads
+_REPORT_LOCK = threading.Lock()
 
 
 class NoApproverFoundError(FileNotFoundError):
@@ -59,13 +95,51 @@ def verify(
     extension: str = ".txt",
     report_always: bool = False,
     scrub: Callable[[str], str] | tuple[Callable[[str], str], ...] | None = None,
+    name: str | None = None,
+    tolerance: float | tuple[float, float] | None = None,
 ) -> bool:
     """Verify.
 
     Args:
         report_always: Always report even if received and approved are equal.
+        name: Name used in file names instead of counting calls to verify within
+            a test. Needed for deterministic file names if verify is called
+            concurrently (see `approval_scope`).
+        tolerance: Compare floats within tolerance instead of exactly. A number
+            is used as relative and absolute tolerance, a pair as (relative,
+            absolute) tolerance. All other text is compared exactly.
+    """
+    return _verify(
+        data,
+        extension,
+        report_always=report_always,
+        scrub=scrub,
+        name=name,
+        compare=_get_compare(tolerance),
+    )
+
+
+def verify_stream(
+    data: Iterable[str] | IO[str],
+    *,
+    extension: str = ".txt",
+    report_always: bool = False,
+    scrub: Callable[[str], str] | tuple[Callable[[str], str], ...] | None = None,
+    name: str | None = None,
+) -> bool:
+    """Verify text produced by an iterable (e.g. a generator) or file-like object.
+
+    Text is scrubbed line by line, written to disk and compared with approved
+    incrementally without holding the whole text in memory. Scrubbers are applied
+    to each line separately and can not match across lines.
+
+    Args:
+        report_always: Always report even if received and approved are equal.
+        name: Name used in file names instead of counting calls (see `verify`).
     """
-    return _verify(data, extension, report_always=report_always, scrub=scrub)
+    return _verify_stream(
+        data, extension, report_always=report_always, scrub=scrub, name=name
+    )
 
 
 def verify_binary(
@@ -73,8 +147,9 @@ def verify_binary(
     *,
     extension: Literal[".jpg", ".jpeg", ".png"],
     report_always: bool = False,
+    name: str | None = None,
 ) -> bool:
-    return _verify(data, extension, report_always=report_always)
+    return _verify(data, extension, report_always=report_always, name=name)
 
 
 def verify_image(
@@ -83,11 +158,13 @@ def verify_image(
     extension: Literal[".jpg", ".jpeg", ".png"],
     report_always: bool = False,
     content_only: bool = False,
+    name: str | None = None,
 ) -> bool:
     """Verify image.
 
     Args:
         content_only: only compare content without metadata.
+        name: Name used in file names instead of counting calls (see `verify`).
     """
     if content_only:
         return _verify(
@@ -95,13 +172,14 @@ def verify_image(
             extension,
             report_always=report_always,
             compare=compare_image_contents_only,
+            name=name,
         )
-    return _verify(data, extension, report_always=report_always)
+    return _verify(data, extension, report_always=report_always, name=name)
 
 
 if PIL_AVAILABLE:
 
-    def _pillow_image_to_bytes(image: Image.Image, extension: str) -> bytes:
+    def _pillow_image_to_bytes(image: "Image.Image", extension: str) -> bytes:
         buffer = BytesIO()
         format_ = extension.replace(".", "")
         if format_ == "jpg":
@@ -110,16 +188,18 @@ if PIL_AVAILABLE:
         return buffer.getvalue()
 
     def verify_image_pillow(
-        data: Image.Image,
+        data: "Image.Image",
         *,
         extension: Literal[".jpg", ".jpeg", ".png"],
         report_always: bool = False,
         content_only: bool = False,
+        name: str | None = None,
     ) -> bool:
         """Verify pillow image.
 
         Args:
             content_only: only compare content without metadata.
+            name: Name used in file names instead of counting calls (see `verify`).
         """
         raw = _pillow_image_to_bytes(data, extension)
         return verify_image(
@@ -127,17 +207,19 @@ if PIL_AVAILABLE:
             extension=extension,
             report_always=report_always,
             content_only=content_only,
+            name=name,
         )
 
 
 if PLOTLY_AVAILABLE:
 
     def verify_plotly(
-        data: str | dict | Figure,
+        data: "str | dict | Figure",
         *,
         # TODO: Maybe support all plotly to_image formats?
         extension: Literal[".json"] = ".json",
         report_always: bool = False,
+        name: str | None = None,
     ) -> bool:
         """Verify Plotly figure. Compare as JSON but report as image (.png).
 
@@ -147,7 +229,10 @@ if PLOTLY_AVAILABLE:
             report_always: Always report even if received and approved are equal.
                 The approved image does not exist. Only the received image is reported.
                 To pass the verification approval needs to be given again.
+            name: Name used in file names instead of counting calls (see `verify`).
         """
+        from plotly.graph_objects import Figure
+
         if isinstance(data, dict):
             data = Figure(data)
         elif isinstance(data, str):
@@ -156,35 +241,43 @@ if PLOTLY_AVAILABLE:
         data_json = data.to_json()
 
         # First verify JSON without reporting (Compare JSON)
-        success = _verify(data_json, extension=".json", report_suppress=True)
+        paths = _get_filepaths(".json", name)
+        success = _verify(
+            data_json,
+            extension=".json",
+            report_suppress=True,
+            paths=paths,
+        )
         if (success and not report_always) or is_continuous_environment():
             return success
 
         # Second verify Image with reporting (Report image) if JSON is different
         figure = Figure(json.loads(data_json))
         data_image = figure.to_image(format="png")
-        success = verify_image(
+        image_paths = _get_filepaths(".png", name)
+        # Images are reported immediately, even if reports are deferred: They are
+        # removed right after and approval is transferred to the JSON below.
+        success = _verify(
             data_image,
             extension=".png",
             report_always=report_always,
+            deferrable=False,
+            paths=image_paths,
         )
 
         # Remove images
-        path = get_filepath(count=False, directory=APPROVALS_DIR)
-        filename = path.name
-        directory = path.parent
-        [file.unlink() for file in directory.glob(escape(filename) + "*.png")]
+        for path in image_paths:
+            if index.exists(path):
+                _unlink(path)
 
         # Create approved file with Plotly JSON
         if success:
-            # HACK: Remove paths generated in previous call to verify w/ JSON
-            FILEPATHS.pop(-3)  # approved.json
-            FILEPATHS.pop(-3)  # received.json
             _verify(
                 data_json,
                 extension=".json",
                 report_suppress=True,
                 auto_approve=True,
+                paths=paths,
             )
             return True
         else:
@@ -198,19 +291,191 @@ def verify_json(
     report_always: bool = False,
     sort: bool = False,
     scrub: Callable[[str], str] | tuple[Callable[[str], str], ...] | None = None,
+    name: str | None = None,
+    structural: bool = False,
+    sort_arrays: bool = False,
+    precision: int | None = None,
+    scrub_paths: dict[str, Any] | None = None,
+    tolerance: float | tuple[float, float] | None = None,
 ) -> bool:
     """Verify as JSON.
 
-    Accepts data as JSON string or JSON serializable object.
+    Accepts data as JSON string or JSON serializable object. Sets are verified
+    as sorted arrays. Data is never modified.
+
+    Args:
+        sort: Sort keys of all objects and elements of a top-level array.
+        name: Name used in file names instead of counting calls (see `verify`).
+        structural: Compare parsed JSON instead of text if text differs.
+            Formatting and key order are ignored. Differences are reported by
+            JSON pointer in continuous integration environments.
+        sort_arrays: Sort elements of all arrays (for arrays without meaningful
+            order).
+        precision: Round floats to given number of decimals.
+        scrub_paths: Replace values selected by JSONPath expressions before
+            serialization, e.g. `{"$.items[*].id": "{{ID}}"}`. A callable is
+            called with the selected value (see `json_path.scrub`).
+        tolerance: Compare floats within tolerance instead of exactly (see
+            `verify`). Combined with `structural` parsed floats are compared.
     """
-    if isinstance(data, str):
-        data = json.loads(data)
-    if sort and isinstance(data, dict):
-        data = sort_dict(data)
-    elif sort and isinstance(data, list):
-        data.sort()
-    data = json.dumps(data, indent=True)
-    return _verify(data, extension=extension, report_always=report_always, scrub=scrub)
+    return _verify(
+        _serialize_json(
+            data,
+            sort,
+            sort_arrays=sort_arrays,
+            precision=precision,
+            scrub_paths=scrub_paths,
+        ),
+        extension=extension,
+        report_always=report_always,
+        scrub=scrub,
+        name=name,
+        compare=_get_compare(tolerance, structural=structural),
+    )
+
+
+async def verify_async(
+    data: str,
+    *,
+    extension: str = ".txt",
+    report_always: bool = False,
+    scrub: Callable[[str], str] | tuple[Callable[[str], str], ...] | None = None,
+    name: str | None = None,
+    tolerance: float | tuple[float, float] | None = None,
+) -> bool:
+    """Verify without blocking the event loop (see `verify`).
+
+    Scrubbing, writing and comparing is done in a thread. Reporters are run as
+    asyncio subprocess. Many verifications can be awaited concurrently (e.g. with
+    `asyncio.gather`). File names are numbered in order of calls.
+    """
+    paths = _get_filepaths(extension, name)
+    return await _verify_async(
+        data,
+        extension,
+        paths=paths,
+        report_always=report_always,
+        scrub=scrub,
+        compare=_get_compare(tolerance),
+    )
+
+
+async def verify_binary_async(
+    data: bytes,
+    *,
+    extension: Literal[".jpg", ".jpeg", ".png"],
+    report_always: bool = False,
+    name: str | None = None,
+) -> bool:
+    """Verify binary without blocking the event loop (see `verify_async`)."""
+    paths = _get_filepaths(extension, name)
+    return await _verify_async(
+        data, extension, paths=paths, report_always=report_always
+    )
+
+
+async def verify_image_async(
+    data: bytes,
+    *,
+    extension: Literal[".jpg", ".jpeg", ".png"],
+    report_always: bool = False,
+    content_only: bool = False,
+    name: str | None = None,
+) -> bool:
+    """Verify image without blocking the event loop (see `verify_async`)."""
+    paths = _get_filepaths(extension, name)
+    return await _verify_async(
+        data,
+        extension,
+        paths=paths,
+        report_always=report_always,
+        compare=compare_image_contents_only if content_only else compare_files,
+    )
+
+
+async def verify_json_async(
+    data: str | dict | list | Any,
+    *,
+    extension: Literal[".json"] = ".json",
+    report_always: bool = False,
+    sort: bool = False,
+    scrub: Callable[[str], str] | tuple[Callable[[str], str], ...] | None = None,
+    name: str | None = None,
+    structural: bool = False,
+    sort_arrays: bool = False,
+    precision: int | None = None,
+    scrub_paths: dict[str, Any] | None = None,
+    tolerance: float | tuple[float, float] | None = None,
+) -> bool:
+    """Verify as JSON without blocking the event loop (see `verify_async`)."""
+    # File paths are allocated before awaiting anything to keep order of calls
+    paths = _get_filepaths(extension, name)
+    data = await asyncio.to_thread(
+        _serialize_json,
+        data,
+        sort,
+        sort_arrays=sort_arrays,
+        precision=precision,
+        scrub_paths=scrub_paths,
+    )
+    return await _verify_async(
+        data,
+        extension,
+        paths=paths,
+        report_always=report_always,
+        scrub=scrub,
+        compare=_get_compare(tolerance, structural=structural),
+    )
+
+
+def _get_compare(
+    tolerance: float | tuple[float, float] | None,
+    *,
+    structural: bool = False,
+) -> Callable[[Path, Path], bool]:
+    compare = compare_json_files if structural else compare_files
+    if tolerance is None:
+        return compare
+    if not structural:
+        compare = compare_files_within_tolerance
+    return partial(compare, tolerance=tolerance)
+
+
+async def _verify_async(data: Any, extension: str, **kwargs) -> bool:
+    """Run `_verify` in a thread and reporters as asyncio subprocess."""
+    loop = asyncio.get_running_loop()
+
+    def run(command: list[str]) -> subprocess.CompletedProcess:
+        # Blocks the thread of `_verify` but not the event loop
+        return asyncio.run_coroutine_threadsafe(_run_async(command), loop).result()
+
+    return await asyncio.to_thread(_verify, data, extension, run=run, **kwargs)
+
+
+@contextmanager
+def approval_scope(name: str) -> Iterator[None]:
+    """Name all verifications within this context.
+
+    File names of verifications are derived from the test and the scope name
+    instead of the order of calls to verify. Scopes are local to the current
+    thread or asyncio task and can be nested:
+
+    ```python
+    def verify_shard(shard):
+        with approval_scope(f"shard-{shard}"):
+            assert verify(process(shard))
+
+    with ThreadPoolExecutor() as executor:
+        assert all(executor.map(verify_shard, range(4)))
+    ```
+    """
+    _validate_name(name)
+    parent = SCOPE.get()
+    token = SCOPE.set(name if parent is None else f"{parent}.{name}")
+    try:
+        yield
+    finally:
+        SCOPE.reset(token)
 
 
 def _verify(
@@ -219,54 +484,241 @@ def _verify(
     *,
     report_always: bool = False,
     report_suppress: bool = False,
+    deferrable: bool = True,
     auto_approve: bool = False,
     compare: Callable = compare_files,
     scrub: Callable[[str], str] | tuple[Callable[[str], str], ...] | None = None,
+    name: str | None = None,
+    paths: tuple[Path, Path] | None = None,
+    run: Callable[[list[str]], subprocess.CompletedProcess] | None = None,
+) -> bool:
+    """Verify.
+
+    Args:
+        deferrable: Report may be deferred to the end of the session (see
+            `REPORT_DEFERRED`). False if received and approved are needed
+            afterwards.
+        paths: Received and approved file paths to reuse instead of allocating new.
+        run: Run reporter command (see `_report`).
+    """
+    received, approved = paths or _get_filepaths(extension, name)
+    if received.suffix not in BINARY_EXTENSIONS:
+        data = _serialize_text(data, scrub)
+    # Fast path: received is only written to disk if needed for comparison
+    # or reporting.
+    fast = not (AUTO_APPROVE or auto_approve or report_always)
+    if pack.is_packed(approved):
+        if fast and pack.compare_contents(data, approved):
+            return True
+        pack.materialize(approved)
+    elif fast and compare_contents(data, approved):
+        return True
+    _write(data, received, approved)
+    return _compare_and_report(
+        received,
+        approved,
+        report_always=report_always,
+        report_suppress=report_suppress,
+        deferrable=deferrable,
+        auto_approve=auto_approve,
+        compare=compare,
+        run=run,
+    )
+
+
+def _verify_stream(
+    data: Iterable[str] | IO[str],
+    extension: str,
+    *,
+    report_always: bool = False,
+    scrub: Callable[[str], str] | tuple[Callable[[str], str], ...] | None = None,
+    name: str | None = None,
+) -> bool:
+    received, approved = _get_filepaths(extension, name)
+    index.mkdir(received.parent)
+    index.mkdir(approved.parent)
+    if pack.is_packed(approved):
+        pack.materialize(approved)
+    if not _exists(approved):
+        create_exclusive(approved)
+        index.record(approved)
+    lines = (_scrub(line, scrub) for line in _iter_lines(data))
+    with open_atomic(received) as file:
+        equal = compare_stream(_tee(lines, file), approved)
+    index.record(received)
+    return _compare_and_report(
+        received,
+        approved,
+        equal=equal,
+        report_always=report_always,
+    )
+
+
+def _compare_and_report(
+    received: Path,
+    approved: Path,
+    *,
+    equal: bool | None = None,
+    report_always: bool = False,
+    report_suppress: bool = False,
+    deferrable: bool = True,
+    auto_approve: bool = False,
+    compare: Callable = compare_files,
+    run: Callable[[list[str]], subprocess.CompletedProcess] | None = None,
 ) -> bool:
-    received = get_filepath(extension=".received" + extension, directory=APPROVALS_DIR)
-    approved = get_filepath(extension=".approved" + extension, directory=APPROVALS_DIR)
-    _write(data, received, approved, scrub)
+    """Compare received with approved and report if different.
+
+    Args:
+        equal: Result of a previous comparison of received with approved.
+        deferrable: Report may be deferred (see `_verify`).
+        run: Run reporter command (see `_report`).
+    """
     if AUTO_APPROVE or auto_approve:
-        shutil.copyfile(received, approved)
-    if compare(received, approved) and not report_always:
-        received.unlink()
+        copy_atomic(received, approved)
+        index.record(approved)
+        compress.track(approved)
+        equal = None
+    if equal is None:
+        equal = compare(received, approved)
+    if equal and not report_always:
+        _unlink(received)
         return True
     else:
         if not report_suppress:
-            _report(received, approved)
-        if compare(received, approved):
-            received.unlink()
-            return True
+            # Reporters need approved as file on disk
+            compress.decompress(approved)
+            if REPORT_DEFERRED and deferrable:
+                # Received and approved are reported at the end of the session
+                DEFERRED_REPORTS.append((received, approved, compare))
+                return equal
+            with _REPORT_LOCK:
+                _report(received, approved, run, compare)
+            # Approved might have been changed by the reporter
+            index.record(approved)
+            equal = compare(received, approved)
+        return _clean_up(received, approved, equal)
+
+
+def _get_filepaths(extension: str, name: str | None = None) -> tuple[Path, Path]:
+    """Allocate received and approved file paths for the current test."""
+    name = _get_name(name)
+    with _FILEPATH_LOCK:
+        if name is None:
+            # Calls to verify within one test are counted
+            received = get_filepath(
+                extension=".received" + extension, directory=APPROVALS_DIR
+            )
+            approved = get_filepath(
+                extension=".approved" + extension, directory=APPROVALS_DIR
+            )
+            received, approved = layout.apply(received), layout.apply(approved)
         else:
-            if os.stat(approved).st_size == 0:
-                approved.unlink()
-            return False
+            base = _get_filepath_base(name)
+            paths = []
+            for kind in (".received", ".approved"):
+                path = base.parent / (base.name + kind + extension)
+                count = count_duplicates(path)
+                paths.append(base.parent / (base.name + count + kind + extension))
+            received, approved = paths
+        orphans.use(approved)
+    return received, approved
+
+
+def _get_filepath_base(name: str | None) -> Path:
+    """Get file path of current test without count and extension."""
+    path = layout.apply(get_filepath(count=False, directory=APPROVALS_DIR))
+    if name is None:
+        return path
+    return path.parent / f"{path.name}.{name}"
+
+
+def _get_name(name: str | None) -> str | None:
+    """Qualify name by current approval scope."""
+    if name is not None:
+        _validate_name(name)
+    scope = SCOPE.get()
+    if scope is None:
+        return name
+    return scope if name is None else f"{scope}.{name}"
+
+
+def _validate_name(name: str):
+    if re.fullmatch(r"[A-Za-z0-9\-_.]+", name) is None:
+        raise ValueError(
+            f"Invalid name '{name}'. "
+            + "Name may only contain letters, numbers, dash, underscore and dot."
+        )
 
 
-def _write(
-    data,
-    received: Path,
-    approved: Path,
-    scrub: Callable[[str], str] | tuple[Callable[[str], str], ...] | None = None,
-):
-    """Write received to disk and create empty approved file if not exists."""
-    received.parent.mkdir(exist_ok=True, parents=True)
-    approved.parent.mkdir(exist_ok=True, parents=True)
+def _clean_up(received: Path, approved: Path, equal: bool) -> bool:
+    """Remove received if equal to approved and approved if empty."""
+    if equal:
+        _unlink(received)
+        return True
+    else:
+        entry = index.lookup(approved)
+        if entry is not None and entry.size == 0:
+            _unlink(approved)
+        return False
+
+
+def report_deferred():
+    """Report all deferred verifications at once.
+
+    Will be called at the end of the session by plugin.py.
+    """
+    reports = DEFERRED_REPORTS.copy()
+    DEFERRED_REPORTS.clear()
+    if not reports:
+        return
+    pairs = [(received, approved) for received, approved, _ in reports]
+    if not _report_batch(pairs):
+        for received, approved, compare in reports:
+            _report(received, approved, compare=compare)
+    for received, approved, compare in reports:
+        # Approved might have been changed by the reporter
+        index.record(approved)
+        _clean_up(received, approved, compare(received, approved))
+
+
+def remove_stale_received():
+    """Remove received files left over from previous sessions.
+
+    Will be called during pytest configuration by plugin.py, after the approvals
+    directory has been indexed.
+    """
+    stale = [path for path in index.FILES if ".received." in path.name]
+    for path in stale:
+        path.unlink(missing_ok=True)
+        index.discard(path)
+    if stale:
+        logger.debug(f"Removed {len(stale)} stale received files.")
+
+
+def _write(data, received: Path, approved: Path):
+    """Write received to disk and create empty approved file if not exists.
+
+    Text has to be serialized already (see `_serialize_text`).
+    """
+    index.mkdir(received.parent)
+    index.mkdir(approved.parent)
     if received.suffix in BINARY_EXTENSIONS:
         _write_binary(data, received, approved)
     else:
-        _write_text(data, received, approved, scrub)
+        _write_text(data, received, approved)
 
 
 def _write_binary(data, received: Path, approved: Path):
-    with open(received, "wb") as file:
+    with open_atomic(received, "wb") as file:
         file.write(data)
-    if not approved.exists():
+    index.record(received)
+    if not _exists(approved):
         empty_file = Path(BASE_DIR / "empty_files" / "empty").with_suffix(
             approved.suffix
         )
         try:
-            shutil.copy(empty_file, approved)
+            create_exclusive(approved, empty_file.read_bytes())
+            index.record(approved)
         except FileNotFoundError as e:
             raise ValueError(
                 "Extension '{0}' not supported. ".format(approved.suffix)
@@ -276,59 +728,269 @@ def _write_binary(data, received: Path, approved: Path):
             ) from e
 
 
-def _write_text(
-    data,
-    received: Path,
-    approved: Path,
+def _write_text(data: str, received: Path, approved: Path):
+    with open_atomic(received) as file:
+        file.write(data)
+    index.record(received)
+    if not _exists(approved):
+        create_exclusive(approved)
+        index.record(approved)
+
+
+def _exists(approved: Path) -> bool:
+    """Check if approved exists either as file or compressed file."""
+    return index.exists(approved) or compress.find(approved) is not None
+
+
+def _unlink(path: Path):
+    path.unlink()
+    index.discard(path)
+
+
+def _serialize_json(
+    data: str | dict | list | Any,
+    sort: bool = False,
+    *,
+    sort_arrays: bool = False,
+    precision: int | None = None,
+    scrub_paths: dict[str, Any] | None = None,
+) -> str:
+    if isinstance(data, str):
+        data = json.loads(data)
+    if scrub_paths:
+        data = json_path.scrub(data, scrub_paths)
+    data = canonical.canonicalize(data, sort_arrays=sort_arrays, precision=precision)
+    if sort and isinstance(data, (list, tuple)) and not sort_arrays:
+        data = canonical.sort(data)
+    # Keys are sorted by the encoder instead of sorting a copy of data first.
+    # Since Python 3.13 the C encoder is used in one go even if indented, which
+    # is faster than streaming with `JSONEncoder.iterencode` (pure Python).
+    return json.dumps(data, indent=True, sort_keys=sort, default=canonical.default)
+
+
+def _serialize_text(
+    data: str,
     scrub: Callable[[str], str] | tuple[Callable[[str], str], ...] | None = None,
-):
+) -> str:
+    """Append trailing newline if missing and apply scrubbers."""
     if len(data) == 0 or data[-1] != "\n":
         data = data + "\n"
+    return _scrub(data, scrub)
+
+
+def _scrub(
+    data: str,
+    scrub: Callable[[str], str] | tuple[Callable[[str], str], ...] | None = None,
+) -> str:
+    """Apply scrubbers one after another.
+
+    Scrubbers are not merged into a single pass (see `scrub.compose_scrubbers`),
+    because a scrubber might match the output of a previous one.
+    """
     if scrub is not None:
         if isinstance(scrub, tuple):
             for s in scrub:
                 data = s(data)
         else:
             data = scrub(data)
-    received.write_text(data)
-    if not approved.exists():
-        approved.touch()
+    return data
 
 
-def _report(received: Path, approved: Path):
+def _iter_lines(data: Iterable[str] | IO[str]) -> Iterator[str]:
+    """Split chunks of text into lines. The last line always ends with a newline."""
+    if hasattr(data, "read"):
+        data = iter(partial(data.read, CHUNK_SIZE), "")
+    rest = ""
+    empty = True
+    for chunk in data:
+        lines = (rest + chunk).split("\n")
+        rest = lines.pop()
+        for line in lines:
+            empty = False
+            yield line + "\n"
+    if rest or empty:
+        yield rest + "\n"
+
+
+def _tee(lines: Iterable[str], file: IO[str]) -> Iterator[str]:
+    """Write lines to file while passing them on."""
+    for line in lines:
+        file.write(line)
+        yield line
+
+
+def _report(
+    received: Path,
+    approved: Path,
+    run: Callable[[list[str]], subprocess.CompletedProcess] | None = None,
+    compare: Callable = compare_files,
+):
+    """Report difference of received and approved.
+
+    Args:
+        run: Run reporter command (default: `_run`).
+        compare: Function used to compare received and approved.
+    """
+    run = run or _run
     if is_continuous_environment():
-        reporters = {"diff": REPORTERS["diff"]}
-    elif received.suffix in BINARY_EXTENSIONS:
+        return _report_diff(received, approved, compare)
+    if received.suffix in BINARY_EXTENSIONS:
         reporters = {k: v for k, v in REPORTERS.items() if v["binary"]}
     else:
         reporters = REPORTERS
-    commands = [r["commands"] for r in reporters.values()]
-    for command in list(chain.from_iterable(commands)):
-        command = [c.replace("%received", str(received)) for c in command]
+    commands = list(chain.from_iterable(r["commands"] for r in reporters.values()))
+    key = _reporter_cache_key(commands)
+    for template in _find_reporters(commands, key):
+        command = [c.replace("%received", str(received)) for c in template]
         command = [c.replace("%approved", str(approved)) for c in command]
         try:
-            completed_process = subprocess.run(  # noqa S603
-                command,
-                capture_output=True,
-                check=False,
-            )
+            completed_process = run(command)
             if completed_process.returncode == 127:  # command not found
                 raise FileNotFoundError()  # noqa: TRY301
         except FileNotFoundError:
             logger.debug(f"Failed to run command `{' '.join(command)}` as approver.")
+            REPORTER_CACHE.pop(key, None)
             continue
+        REPORTER_CACHE[key] = template
         if completed_process.returncode == 0:
             return
         elif completed_process.returncode == 1:
-            msg = (
-                "Received is different from approved:\n"
-                + f"\t{received}\n\t{approved}\n"
-            )
-            print(msg, completed_process.stdout.decode("utf-8"), sep="\n")
+            _print_difference(received, approved, completed_process.stdout.decode())
             return False
         else:
             raise NoApproverFoundError()
 
 
+def _run(command: list[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(  # noqa S603
+        command,
+        capture_output=True,
+        check=False,
+    )
+
+
+async def _run_async(command: list[str]) -> subprocess.CompletedProcess:
+    process = await asyncio.create_subprocess_exec(
+        *command,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate()
+    return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
+
+def _report_diff(received: Path, approved: Path, compare: Callable = compare_files):
+    """Print unified diff computed in-process (e.g. in CI)."""
+    if received.suffix in BINARY_EXTENSIONS:
+        if compare_files(received, approved):
+            return
+        _print_difference(
+            received, approved, "Binary files received and approved differ\n"
+        )
+        return False
+    config = definitions.CONFIG
+    if getattr(compare, "func", compare) is compare_json_files:
+        tolerance = getattr(compare, "keywords", {}).get("tolerance")
+        text = _json_pointer_diff(received, approved, tolerance)
+        if text is not None:
+            if not text:
+                return
+            _print_difference(received, approved, text)
+            return False
+    color = config.get("diff-color", "auto")
+    text = unified_diff(
+        received,
+        approved,
+        max_hunks=config.get("diff-max-hunks", DIFF_MAX_HUNKS),
+        max_bytes=config.get("diff-max-bytes", DIFF_MAX_BYTES),
+        color=color == "always" or (color == "auto" and sys.stdout.isatty()),
+    )
+    if not text:
+        return
+    _print_difference(received, approved, text)
+    return False
+
+
+def _json_pointer_diff(
+    received: Path,
+    approved: Path,
+    tolerance: float | tuple[float, float] | None = None,
+) -> str | None:
+    """Diff JSON files by JSON pointer. None if a file is not valid JSON."""
+    try:
+        received_json = json_diff.load(received)
+        approved_json = json_diff.load(approved)
+    except ValueError:
+        return None
+    return json_diff.pointer_diff(
+        received_json,
+        approved_json,
+        max_differences=definitions.CONFIG.get("diff-max-hunks", DIFF_MAX_HUNKS),
+        tolerance=tolerance,
+    )
+
+
+def _print_difference(received: Path, approved: Path, diff: str):
+    msg = "Received is different from approved:\n" + f"\t{received}\n\t{approved}\n"
+    print(msg, diff, sep="\n")
+
+
+def _report_batch(pairs: list[tuple[Path, Path]]) -> bool:
+    """Report all pairs with one call to a reporter supporting it (e.g. Meld tabs).
+
+    Returns False if no such reporter could be run.
+    """
+    if is_continuous_environment() or any(
+        received.suffix in BINARY_EXTENSIONS for received, _ in pairs
+    ):
+        return False
+    for reporter in REPORTERS.values():
+        if "batch" not in reporter:
+            continue
+        for template in reporter["commands"]:
+            if shutil.which(template[0]) is None:
+                continue
+            command = [c for c in template if c not in ("%received", "%approved")]
+            for received, approved in pairs:
+                for c in reporter["batch"]:
+                    c = c.replace("%received", str(received))
+                    command.append(c.replace("%approved", str(approved)))
+            try:
+                completed_process = subprocess.run(  # noqa S603
+                    command,
+                    capture_output=True,
+                    check=False,
+                )
+            except FileNotFoundError:
+                completed_process = None
+            if completed_process is None or completed_process.returncode == 127:
+                logger.debug(
+                    f"Failed to run command `{' '.join(command)}` as approver."
+                )
+                continue
+            return True
+    return False
+
+
+def _find_reporters(commands: list[list[str]], key: str) -> Iterator[list[str]]:
+    """Yield reporter commands to try.
+
+    The command known to work is yielded first. Other commands are only yielded
+    if their program can be found.
+    """
+    cached = REPORTER_CACHE.get(key)
+    if cached is not None and cached in commands:
+        yield cached
+    for command in commands:
+        if command != cached and shutil.which(command[0]) is not None:
+            yield command
+
+
+def _reporter_cache_key(commands: list[list[str]]) -> str:
+    """Key working reporter by host, PATH and list of reporter commands."""
+    key = json.dumps([socket.gethostname(), os.environ.get("PATH", ""), commands])
+    return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+
 def is_continuous_environment() -> bool:
     return os.environ.get("CI") is not None
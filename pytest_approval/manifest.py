@@ -0,0 +1,160 @@
+"""Manifest of content digests of approved files.
+
+The manifest maps approved files to their size, modification time and a BLAKE2
+digest of their content. As long as size and modification time of an approved
+file match its manifest entry, received output is compared by digest without
+reading the approved file.
+
+The manifest is loaded during pytest configuration and saved when pytest exits
+by plugin.py. With pytest-xdist, workers hand their changes over to the
+controller which saves them all at once. Entries are recorded whenever received
+and approved have been found to be equal (which includes approval and auto
+approval).
+
+A match of size and modification time alone is trusted. An approved file which
+is changed without changing its size within the timestamp granularity of the
+file system (e.g. two seconds on FAT) goes unnoticed. Delete the manifest to
+have all digests recorded anew.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+from pytest_approval import index
+from pytest_approval.utils import normalize_newlines
+
+logger = logging.getLogger(__name__)
+
+FILENAME = ".approval-manifest"
+DIGEST_SIZE = 16
+
+ROOT: Path | None = None
+ENTRIES: dict[str, tuple[int, int, str]] = {}
+CHANGED: set[str] = set()
+
+
+def load(directory: Path) -> None:
+    global ROOT
+    ROOT = Path(directory)
+    ENTRIES.clear()
+    CHANGED.clear()
+    ENTRIES.update(_read(ROOT / FILENAME))
+
+
+def save() -> None:
+    """Merge changed entries into manifest on disk.
+
+    Manifest on disk might have been updated in the meantime by other processes
+    (e.g. pytest-xdist workers). Losing an entry is harmless, it will be
+    recorded again on the next run.
+    """
+    if ROOT is None or not CHANGED:
+        return
+    path = ROOT / FILENAME
+    entries = _read(path)
+    entries.update({key: ENTRIES[key] for key in CHANGED if key in ENTRIES})
+    tmp = path.with_name(f"{FILENAME}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(entries, sort_keys=True))
+    tmp.replace(path)
+    CHANGED.clear()
+
+
+def pop_changes() -> dict[str, tuple[int, int, str]]:
+    """Remove changed entries from being saved and return them.
+
+    Used by pytest-xdist workers to hand changes over to the controller.
+    """
+    changes = {key: ENTRIES[key] for key in CHANGED if key in ENTRIES}
+    CHANGED.clear()
+    return changes
+
+
+def merge(changes: dict[str, tuple[int, int, str]]) -> None:
+    """Merge changes of another process to be saved by this process."""
+    ENTRIES.update({key: tuple(entry) for key, entry in changes.items()})
+    CHANGED.update(changes)
+
+
+def clear() -> None:
+    global ROOT
+    ROOT = None
+    ENTRIES.clear()
+    CHANGED.clear()
+
+
+def new_hash() -> hashlib.blake2b:
+    return hashlib.blake2b(digest_size=DIGEST_SIZE)
+
+
+def digest(data: str | bytes) -> str:
+    """Compute digest. Text is digested with universal newlines."""
+    if isinstance(data, str):
+        data = normalize_newlines(data).encode()
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).hexdigest()
+
+
+def lookup(approved: Path) -> str | None:
+    """Get digest of approved.
+
+    Returns None if approved is not in the manifest or has been modified since.
+    """
+    key = _key(approved)
+    if key is None or key not in ENTRIES:
+        return None
+    entry = index.lookup(approved)
+    size, mtime_ns, digest_ = ENTRIES[key]
+    if entry is None or entry != (size, mtime_ns):
+        return None
+    return digest_
+
+
+def compare_digest(received: str | bytes, approved: Path) -> bool | None:
+    """Compare digest of received with digest of approved found in manifest.
+
+    Returns None if digest of approved is unknown.
+    """
+    digest_ = lookup(approved)
+    if digest_ is None:
+        return None
+    return digest(received) == digest_
+
+
+def record(approved: Path, received: str | bytes) -> None:
+    """Record digest of received for approved, given both are equal."""
+    if is_tracked(approved):
+        record_digest(approved, digest(received))
+
+
+def record_digest(approved: Path, digest_: str) -> None:
+    key = _key(approved)
+    if key is None:
+        return
+    entry = index.lookup(approved)
+    if entry is None:
+        return
+    ENTRIES[key] = (entry.size, entry.mtime_ns, digest_)
+    CHANGED.add(key)
+
+
+def is_tracked(path: Path) -> bool:
+    return _key(path) is not None
+
+
+def _key(path: Path) -> str | None:
+    if ROOT is None or not path.is_relative_to(ROOT):
+        return None
+    return path.relative_to(ROOT).as_posix()
+
+
+def _read(path: Path) -> dict[str, tuple[int, int, str]]:
+    try:
+        with open(path, "rb") as file:
+            return {k: tuple(v) for k, v in json.load(file).items()}
+    except FileNotFoundError:
+        return {}
+    except (ValueError, TypeError, AttributeError):
+        logger.debug(f"Ignoring invalid manifest {path}.")
+        return {}
@@ -0,0 +1,137 @@
+"""Detection of orphaned approved files.
+
+Every approved file path allocated by a verification is recorded during the
+session. At the end of a session which ran the full test suite, approved files
+in the approvals directory which have not been used are orphans (e.g. left
+behind by renamed or deleted tests). Orphans are reported and, if requested,
+deleted (see plugin.py).
+
+Approved files of tests which did not pass (e.g. skipped or failed before
+calling verify) are never orphans. Neither are approved files with a hashed
+parameter ID (e.g. `test_foo.py--test_bar[394768595].approved.txt`) of a
+collected test whose parameter ID is hashed: The hash changes with the
+representation of the parameters, which might depend on versions of
+dependencies. Paths are compared in flat layout, without
+compression suffix. Approved files in packs are orphans on their own.
+"""
+
+import logging
+import re
+from pathlib import Path
+
+from pytest_approval import compress, index, layout, pack
+
+logger = logging.getLogger(__name__)
+
+# Parameter ID replaced by a hash (see pytest-nodeid-to-filepath)
+HASHED_ID = re.compile(r"\[\d+\](?=\.)")
+
+# will be instantiated during pytest configuration by plugin.py
+DIRECTORY: Path | None = None  # None if approvals directory is not configured
+# approved files used during the session
+USED: set[Path] = set()
+# file paths of tests which did not pass without count and extension
+PROTECTED: set[Path] = set()
+# file paths of tests with hashed parameter ID without ID, count and extension
+HASHED: set[Path] = set()
+# True if tests have been deselected or could not be collected
+PARTIAL: bool = False
+
+
+def use(approved: Path):
+    USED.add(layout.flatten(approved))
+
+
+def protect(base: Path):
+    """Protect approved files of a test from being orphans."""
+    PROTECTED.add(layout.flatten(base))
+
+
+def protect_hashed(base: Path):
+    """Protect approved files of a test with hashed parameter ID from being orphans.
+
+    Approved files with any hash are protected.
+    """
+    base = layout.flatten(base)
+    HASHED.add(base.with_name(base.name[: base.name.index("[")]))
+
+
+def find() -> list[Path]:
+    """Find approved files in approvals directory which have not been used.
+
+    Approved files in packs are given by their path in flat layout.
+    """
+    if DIRECTORY is None:
+        return []
+    orphans = []
+    for path in sorted(p for p in DIRECTORY.rglob("*") if p.is_file()):
+        if path.name.startswith("."):  # e.g. manifest or temporary files
+            continue
+        if path.name.endswith(pack.SUFFIX):
+            packed = (path.parent / name for name in pack.names(path))
+            orphans.extend(p for p in packed if _is_orphan(p))
+        elif ".approved." in path.name and _is_orphan(_strip(path)):
+            orphans.append(path)
+    return orphans
+
+
+def prune(orphans: list[Path]):
+    """Delete orphaned approved files and remove them from packs."""
+    for path in orphans:
+        if index.exists(path):
+            path.unlink()
+            index.discard(path)
+        else:
+            pack.put(path, None)
+    pack.save()
+    logger.debug(f"Pruned {len(orphans)} orphaned approved files.")
+
+
+def pop_state() -> dict:
+    """Pop state of the session to be merged into another (pytest-xdist)."""
+    state = {
+        "used": [str(p) for p in USED],
+        "protected": [str(p) for p in PROTECTED],
+        "hashed": [str(p) for p in HASHED],
+        "partial": PARTIAL,
+    }
+    clear()
+    return state
+
+
+def merge(state: dict):
+    global PARTIAL
+    USED.update(Path(p) for p in state.get("used", []))
+    PROTECTED.update(Path(p) for p in state.get("protected", []))
+    HASHED.update(Path(p) for p in state.get("hashed", []))
+    PARTIAL = PARTIAL or state.get("partial", False)
+
+
+def clear():
+    global PARTIAL
+    USED.clear()
+    PROTECTED.clear()
+    HASHED.clear()
+    PARTIAL = False
+
+
+def _strip(path: Path) -> Path:
+    """Remove compression suffix and move to flat layout."""
+    if path.suffix in compress.FORMATS.values():
+        path = path.with_suffix("")
+    return layout.flatten(path)
+
+
+def _is_orphan(approved: Path) -> bool:
+    if approved in USED:
+        return False
+    # Approved file names start with the test file path followed by a dot
+    # (e.g. `test_foo.py--test_bar.2.approved.txt`)
+    name = approved.name
+    position = name.find(".")
+    while position != -1:
+        if approved.parent / name[:position] in PROTECTED:
+            return False
+        position = name.find(".", position + 1)
+    match = HASHED_ID.search(name)
+    return match is None or approved.parent / name[: match.start()] not in HASHED
@@ -0,0 +1,214 @@
+"""Packed store of approved text files: One file per test module.
+
+Instead of one approved file per verification, all approved text files of a
+test module are stored in a single pack file next to where the approved files
+would be (e.g. `test_foo.py.approved.pack`). Binary approved files are still
+stored as separate files.
+
+A pack file starts with a header line, followed by a line with a JSON table of
+approved file names mapped to offset and length of their content, followed by
+the contents:
+
+    pytest-approval-pack 1
+    {"test_foo.py--test_bar.approved.txt": [0, 12]}
+    Hello World!
+
+Packs are memory mapped on first use, which reads only the table. Lookup of a
+content is a slice of the mapping.
+
+If received and approved differ, approved is materialized as a separate file
+for reporters. Materialized approved files are absorbed into their packs and
+removed when the session finishes (see plugin.py).
+"""
+
+import json
+import logging
+import mmap
+import threading
+from pathlib import Path
+from typing import NamedTuple
+
+from pytest_approval import index, layout
+from pytest_approval.definitions import BINARY_EXTENSIONS
+from pytest_approval.utils import normalize_newlines, open_atomic
+
+logger = logging.getLogger(__name__)
+
+HEADER = b"pytest-approval-pack 1\n"
+SUFFIX = ".approved.pack"
+
+
+class InvalidPackError(ValueError):
+    def __init__(self, path: Path):
+        super().__init__(f"Invalid approval pack {path}.")
+
+
+class Pack(NamedTuple):
+    mapping: mmap.mmap | None  # None if pack file does not exist or is empty
+    offsets: dict[str, tuple[int, int]]  # relative to start of contents
+    start: int
+
+
+# will be instantiated during pytest configuration by plugin.py
+ENABLED: bool = False
+# loaded packs by path
+PACKS: dict[Path, Pack] = {}
+# changed contents by pack path and approved file name (None if removed)
+CHANGES: dict[Path, dict[str, bytes | None]] = {}
+# approved files written to disk for comparison and reporting
+MATERIALIZED: set[Path] = set()
+
+_LOCK = threading.Lock()
+
+
+def is_packed(approved: Path) -> bool:
+    return ENABLED and approved.suffix not in BINARY_EXTENSIONS
+
+
+def get_pack_path(approved: Path) -> Path:
+    """Path of pack file of the test module of approved."""
+    flat = layout.flatten(approved)
+    module = flat.name.split(layout.SEPARATOR, maxsplit=1)[0]
+    return flat.parent / (module + SUFFIX)
+
+
+def get(approved: Path) -> bytes | None:
+    """Get content of approved or None if approved is not in pack."""
+    path = get_pack_path(approved)
+    key = _key(approved)
+    changes = CHANGES.get(path, {})
+    if key in changes:
+        return changes[key]
+    pack = _load(path)
+    if pack.mapping is None or key not in pack.offsets:
+        return None
+    offset, length = pack.offsets[key]
+    return pack.mapping[pack.start + offset : pack.start + offset + length]
+
+
+def names(path: Path) -> list[str]:
+    """Names of approved files in pack at path."""
+    changes = CHANGES.get(path, {})
+    names_ = set(_load(path).offsets) | set(changes)
+    return sorted(n for n in names_ if changes.get(n, b"") is not None)
+
+
+def put(approved: Path, content: bytes | None):
+    """Change content of approved. Remove approved from pack if content is None."""
+    CHANGES.setdefault(get_pack_path(approved), {})[_key(approved)] = content
+
+
+def compare_contents(received: str, approved: Path) -> bool:
+    """Compare received text with approved text in pack.
+
+    Text is compared with universal newlines like `compare_files` does.
+    """
+    content = get(approved)
+    if content is None:
+        return False
+    return normalize_newlines(content.decode("utf-8")) == normalize_newlines(received)
+
+
+def materialize(approved: Path):
+    """Write approved from pack to disk to be compared and reported as file.
+
+    If approved is not in pack, an existing approved file is left as is. It will
+    be absorbed into the pack as well.
+    """
+    MATERIALIZED.add(approved)
+    content = get(approved)
+    if content is None:
+        return
+    index.mkdir(approved.parent)
+    with open_atomic(approved, "wb") as file:
+        file.write(content)
+    index.record(approved)
+
+
+def absorb():
+    """Move materialized approved files into their packs."""
+    for approved in sorted(MATERIALIZED):
+        try:
+            content = approved.read_bytes()
+        except FileNotFoundError:
+            # Approved has been removed because it was empty (not approved)
+            put(approved, None)
+            continue
+        if (content or None) != get(approved):
+            put(approved, content or None)
+        approved.unlink()
+        index.discard(approved)
+    MATERIALIZED.clear()
+
+
+def save():
+    """Write changed packs to disk."""
+    for path, changes in CHANGES.items():
+        pack = _load(path)
+        contents = {
+            name: pack.mapping[pack.start + offset : pack.start + offset + length]
+            for name, (offset, length) in pack.offsets.items()
+        }
+        contents.update(changes)
+        contents = {k: v for k, v in contents.items() if v is not None}
+        # Release memory map before file is replaced
+        _close(path)
+        if contents:
+            _write(path, contents)
+        else:
+            path.unlink(missing_ok=True)
+        index.record(path)
+    CHANGES.clear()
+
+
+def clear():
+    for path in list(PACKS):
+        _close(path)
+    CHANGES.clear()
+    MATERIALIZED.clear()
+
+
+def _key(approved: Path) -> str:
+    """Name of approved in flat layout. Packs are independent of layout."""
+    return layout.flatten(approved).name
+
+
+def _load(path: Path) -> Pack:
+    with _LOCK:
+        if path not in PACKS:
+            PACKS[path] = _read(path)
+        return PACKS[path]
+
+
+def _read(path: Path) -> Pack:
+    try:
+        with open(path, "rb") as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):  # ValueError: empty file
+        return Pack(None, {}, 0)
+    end = mapping.find(b"\n", len(HEADER))
+    if mapping[: len(HEADER)] != HEADER or end == -1:
+        mapping.close()
+        raise InvalidPackError(path)
+    offsets = json.loads(mapping[len(HEADER) : end])
+    return Pack(mapping, {k: tuple(v) for k, v in offsets.items()}, end + 1)
+
+
+def _write(path: Path, contents: dict[str, bytes]):
+    offsets = {}
+    offset = 0
+    for name in sorted(contents):
+        offsets[name] = [offset, len(contents[name])]
+        offset += len(contents[name])
+    with open_atomic(path, "wb") as file:
+        file.write(HEADER)
+        file.write(json.dumps(offsets).encode() + b"\n")
+        for name in sorted(contents):
+            file.write(contents[name])
+    logger.debug(f"Wrote {len(contents)} approved files to {path}.")
+
+
+def _close(path: Path):
+    pack = PACKS.pop(path, None)
+    if pack is not None and pack.mapping is not None:
+        pack.mapping.close()
@@ -1,10 +1,32 @@
+import os
+from functools import partial
 from pathlib import Path
 
-from pytest_approval import main
-from pytest_approval.definitions import CONFIG
+import pytest
+
+from pytest_approval import (
+    compare,
+    compress,
+    definitions,
+    index,
+    layout,
+    main,
+    manifest,
+    orphans,
+    pack,
+)
+from pytest_approval.config import _read_config
 
 auto_approve: bool = False
 
+REPORTER_CACHE_KEY = "pytest-approval/reporters"
+# keys of output handed over from pytest-xdist workers to the controller
+REPORTS_KEY = "pytest_approval_reports"
+MANIFEST_KEY = "pytest_approval_manifest"
+MATERIALIZED_KEY = "pytest_approval_materialized"
+COMPRESS_KEY = "pytest_approval_compress"
+ORPHANS_KEY = "pytest_approval_orphans"
+
 
 def pytest_addoption(parser):
     parser.addoption(
@@ -12,13 +34,257 @@ def pytest_addoption(parser):
         action="store_true",
         help="Automatically approve every approval test",
     )
+    parser.addoption(
+        "--approval-report",
+        choices=("immediate", "deferred"),
+        default="immediate",
+        help="Report differences immediately or all at once at the end of the session",
+    )
+    parser.addoption(
+        "--approval-migrate-layout",
+        action="store_true",
+        help="Move approval files to the configured approvals-layout and exit",
+    )
+    parser.addoption(
+        "--approval-prune",
+        action="store_true",
+        help="Delete approved files not used by any test (only if all tests ran)",
+    )
+
+
+def pytest_cmdline_main(config):
+    if not config.getoption("--approval-migrate-layout"):
+        return None
+    definitions.CONFIG = _read_config(config.rootpath, config.inipath)
+    approvals_dir = _get_approvals_dir(config)
+    if approvals_dir is None:
+        msg = "Migration requires approvals-dir to be set."
+        raise pytest.UsageError(msg)
+    moved = layout.migrate(approvals_dir, layout.get_layout())
+    print(f"Moved {len(moved)} approval files to {layout.get_layout()} layout.")
+    return 0
 
 
 def pytest_configure(config):
+    if hasattr(config, "workerinput"):
+        # pytest-xdist worker: Configuration has been read by the controller
+        definitions.CONFIG = config.workerinput["pytest_approval_config"]
+    else:
+        definitions.CONFIG = _read_config(config.rootpath, config.inipath)
     main.ROOT_DIR = config.rootpath
     main.AUTO_APPROVE = config.getoption("--auto-approve")
-    approvals_dir = CONFIG.get("approvals-dir", None)
+    main.REPORT_DEFERRED = config.getoption("--approval-report") == "deferred"
+    pack.ENABLED = definitions.CONFIG.get("approvals-store", "files") == "packed"
+    _validate_layout(config)
+    _configure_compression()
+    cache = getattr(config, "cache", None)  # None if cacheprovider is disabled
+    if cache is not None:
+        main.REPORTER_CACHE = cache.get(REPORTER_CACHE_KEY, {})
+    approvals_dir = definitions.CONFIG.get("approvals-dir", None)
     if approvals_dir is not None:
         main.APPROVALS_DIR = approvals_dir
         approved_dir_path = Path(main.ROOT_DIR) / Path(main.APPROVALS_DIR)
         approved_dir_path.mkdir(parents=True, exist_ok=True)
+        index.build(approved_dir_path)
+        if not hasattr(config, "workerinput"):
+            # pytest-xdist workers would remove received files of each other
+            main.remove_stale_received()
+        manifest.load(approved_dir_path)
+        orphans.DIRECTORY = approved_dir_path
+    else:
+        # Approval files are stored next to test files. Do not index whole project.
+        index.clear()
+        manifest.clear()
+        orphans.DIRECTORY = None
+    orphans.clear()
+
+
+def _get_approvals_dir(config) -> Path | None:
+    approvals_dir = definitions.CONFIG.get("approvals-dir", None)
+    if approvals_dir is None:
+        return None
+    return Path(config.rootpath) / Path(approvals_dir)
+
+
+def _validate_layout(config):
+    layout_ = layout.get_layout()
+    if layout_ not in layout.LAYOUTS:
+        msg = f"Invalid approvals-layout '{layout_}'. Must be one of {layout.LAYOUTS}."
+        raise pytest.UsageError(msg)
+    if layout_ != layout.FLAT and _get_approvals_dir(config) is None:
+        msg = f"approvals-layout '{layout_}' requires approvals-dir to be set."
+        raise pytest.UsageError(msg)
+
+
+def _configure_compression():
+    format_ = definitions.CONFIG.get("approvals-compression", None)
+    if format_ is not None and format_ not in compress.FORMATS:
+        msg = (
+            f"Invalid approvals-compression '{format_}'. "
+            + f"Must be one of {tuple(compress.FORMATS)}."
+        )
+        raise pytest.UsageError(msg)
+    if format_ == "zstd" and not compress.ZSTD_AVAILABLE:
+        msg = "approvals-compression 'zstd' requires Python 3.14 or later."
+        raise pytest.UsageError(msg)
+    compress.FORMAT = format_
+    compress.THRESHOLD = definitions.CONFIG.get(
+        "approvals-compression-threshold", compress.THRESHOLD
+    )
+
+
+def pytest_collectreport(report):
+    if report.skipped or report.failed:
+        orphans.PARTIAL = True
+
+
+def pytest_collection_finish(session):
+    if orphans.DIRECTORY is None:
+        return
+    for item in session.items:
+        if _has_hashed_id(item.nodeid):
+            orphans.protect_hashed(_get_filepath_base(item.nodeid))
+
+
+def pytest_deselected(items):
+    if items:
+        orphans.PARTIAL = True
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(item, call):
+    report = yield
+    if orphans.DIRECTORY is not None and (report.skipped or report.failed):
+        # Test might not have used all of its approved files
+        orphans.protect(_get_filepath_base(item.nodeid))
+    return report
+
+
+def _has_hashed_id(nodeid: str) -> bool:
+    """Check if parameter ID is replaced by a hash in file paths of test."""
+    if "[" not in nodeid or not nodeid.endswith("]"):
+        return False
+    params = nodeid[nodeid.index("[") + 1 : -1]
+    name = _get_filepath_base(nodeid).name
+    return not name.endswith(f"[{params.replace(' ', '_')}]")
+
+
+def _get_filepath_base(nodeid: str) -> Path:
+    """Get file path of test without count and extension."""
+    # PYTEST_CURRENT_TEST is not set if a test is skipped by a marker
+    current = os.environ.get("PYTEST_CURRENT_TEST")
+    os.environ["PYTEST_CURRENT_TEST"] = nodeid
+    try:
+        return main._get_filepath_base(None)
+    finally:
+        if current is None:
+            os.environ.pop("PYTEST_CURRENT_TEST", None)
+        else:
+            os.environ["PYTEST_CURRENT_TEST"] = current
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Pass configuration from pytest-xdist controller to workers."""
+    node.workerinput["pytest_approval_config"] = definitions.CONFIG
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Merge output of pytest-xdist worker into controller."""
+    workeroutput = getattr(node, "workeroutput", {})
+    for received, approved, compare_name, keywords in workeroutput.get(REPORTS_KEY, []):
+        compare_ = getattr(compare, compare_name)
+        if keywords:
+            compare_ = partial(compare_, **keywords)
+        main.DEFERRED_REPORTS.append((Path(received), Path(approved), compare_))
+    manifest.merge(workeroutput.get(MANIFEST_KEY, {}))
+    pack.MATERIALIZED.update(Path(p) for p in workeroutput.get(MATERIALIZED_KEY, []))
+    compress.WRITTEN.update(Path(p) for p in workeroutput.get(COMPRESS_KEY, []))
+    orphans.merge(workeroutput.get(ORPHANS_KEY, {}))
+    main.REPORTER_CACHE.update(workeroutput.get(REPORTER_CACHE_KEY, {}))
+
+
+def pytest_sessionfinish(session, exitstatus):
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is None:
+        main.report_deferred()
+        # After reporting, approved files can be moved into packs
+        pack.absorb()
+        pack.save()
+        compress.absorb()
+        _report_orphans(session, exitstatus)
+        return
+    # pytest-xdist worker: Hand over to controller
+    # Comparisons with options (e.g. tolerance) are partials
+    workeroutput[REPORTS_KEY] = [
+        (
+            str(received),
+            str(approved),
+            getattr(compare_, "func", compare_).__name__,
+            getattr(compare_, "keywords", {}),
+        )
+        for received, approved, compare_ in main.DEFERRED_REPORTS
+    ]
+    main.DEFERRED_REPORTS.clear()
+    workeroutput[MANIFEST_KEY] = manifest.pop_changes()
+    workeroutput[MATERIALIZED_KEY] = [str(p) for p in pack.MATERIALIZED]
+    pack.MATERIALIZED.clear()
+    workeroutput[COMPRESS_KEY] = [str(p) for p in compress.WRITTEN]
+    compress.WRITTEN.clear()
+    workeroutput[ORPHANS_KEY] = orphans.pop_state()
+    workeroutput[REPORTER_CACHE_KEY] = main.REPORTER_CACHE
+
+
+def _report_orphans(session, exitstatus):
+    """Report or delete approved files not used by any test."""
+    config = session.config
+    if orphans.DIRECTORY is None:
+        return
+    prune = config.getoption("--approval-prune")
+    reporter = config.pluginmanager.get_plugin("terminalreporter")
+    if not _is_full_run(session, exitstatus):
+        if prune and reporter is not None:
+            reporter.write_sep("=", "orphaned approved files")
+            reporter.write_line(
+                "Not pruning orphaned approved files: Not all tests have been run."
+            )
+        return
+    found = orphans.find()
+    if prune:
+        orphans.prune(found)
+    if not found or reporter is None:
+        return
+    reporter.write_sep("=", "orphaned approved files")
+    for path in found:
+        reporter.write_line(str(path.relative_to(config.rootpath)))
+    if prune:
+        reporter.write_line(f"Deleted {len(found)} orphaned approved files.")
+    else:
+        reporter.write_line("Run pytest with --approval-prune to delete them.")
+
+
+def _is_full_run(session, exitstatus) -> bool:
+    """Check if the whole test suite has been collected and run."""
+    config = session.config
+    return (
+        config.args_source != pytest.Config.ArgsSource.ARGS
+        and not orphans.PARTIAL
+        and not config.getoption("lf", False)
+        and not config.getoption("collectonly", False)
+        and not session.shouldfail
+        and not session.shouldstop
+        and exitstatus in (pytest.ExitCode.OK, pytest.ExitCode.TESTS_FAILED)
+    )
+
+
+def pytest_unconfigure(config):
+    manifest.save()
+    pack.clear()
+    compress.WRITTEN.clear()
+    if hasattr(config, "workerinput"):
+        # Reporter cache has been handed over to pytest-xdist controller
+        return
+    cache = getattr(config, "cache", None)
+    if cache is not None:
+        cache.set(REPORTER_CACHE_KEY, main.REPORTER_CACHE)
@@ -1,5 +1,5 @@
 import re
-from functools import partial
+from functools import lru_cache, partial
 from typing import Callable
 
 
@@ -53,6 +53,7 @@ def scrub(text: str, regex: str, sub: str) -> str:
     return re.sub(regex, sub, text)
 
 
+@lru_cache
 def get_datetime_scrubber(
     example: str,
     sub: str = "{{DATETIME}}",
@@ -63,6 +64,126 @@ def get_datetime_scrubber(
     raise NoDatetimeScrubberFoundError("No datetime scrubber found for '%s'." % example)
 
 
+@lru_cache
+def get_all_datetimes_scrubber(sub: str = "{{DATETIME}}") -> Callable[[str], str]:
+    """Get scrubber for all supported datetime formats.
+
+    All formats are compiled into one regular expression and every datetime is
+    replaced in a single scan over the text. If multiple formats match at the same
+    position the longest match wins.
+    """
+    return partial(_scrub_longest, patterns=_compile_datetime_formats(), sub=sub)
+
+
+@lru_cache
 def get_uuid_scrubber(sub: str = "{{UUID}}") -> Callable[[str], str]:
     regex = r"[0-9a-fA-F]{8}\-[0-9a-fA-F]{4}\-[0-9a-fA-F]{4}\-[0-9a-fA-F]{4}\-[0-9a-fA-F]{12}"  # noqa
     return partial(scrub, regex=regex, sub=sub)
+
+
+@lru_cache
+def _compile_datetime_formats() -> tuple[re.Pattern, ...]:
+    """Compile combined regex of all datetime formats followed by each format."""
+    regexes = sorted(SUPPORTED_DATETIME_FORMATS, key=len, reverse=True)
+    combined = re.compile("|".join(f"(?:{regex})" for regex in regexes))
+    return (combined, *(re.compile(regex) for regex in regexes))
+
+
+def _scrub_longest(text: str, patterns: tuple[re.Pattern, ...], sub: str) -> str:
+    """Replace matches of first pattern by longest match of other patterns."""
+    combined, *alternatives = patterns
+    parts = []
+    pos = 0
+    while (match := combined.search(text, pos)) is not None:
+        start = match.start()
+        end = match.end()
+        for pattern in alternatives:
+            alternative = pattern.match(text, start)
+            if alternative is not None and alternative.end() > end:
+                end = alternative.end()
+        parts.append(text[pos:start])
+        parts.append(sub)
+        pos = end
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+def compose_scrubbers(*scrubbers: Callable[[str], str]) -> Callable[[str], str]:
+    """Compose multiple scrubbers into one.
+
+    Consecutive regex based scrubbers (as returned by `get_datetime_scrubber` and
+    `get_uuid_scrubber`) are merged into one precompiled regular expression and
+    applied in a single pass over the text. Other callables are applied one after
+    another.
+
+    In contrast to applying scrubbers one after another, overlapping matches of
+    merged scrubbers are resolved by position: The leftmost match wins and for
+    matches at the same position the first given scrubber wins. Therefore
+    composing is opt-in: Tuples of scrubbers given to verify are applied one after
+    another.
+    """
+    steps: list[Callable[[str], str]] = []
+    specs: list[tuple[str, str]] = []
+    for scrubber in scrubbers:
+        spec = _get_spec(scrubber)
+        if spec is not None:
+            specs.append(spec)
+            continue
+        if specs:
+            steps.append(_merge(tuple(specs)))
+            specs = []
+        steps.append(scrubber)
+    if specs:
+        steps.append(_merge(tuple(specs)))
+    if len(steps) == 1:
+        return steps[0]
+    return partial(_apply_sequentially, scrubbers=tuple(steps))
+
+
+def _apply_sequentially(
+    text: str,
+    scrubbers: tuple[Callable[[str], str], ...],
+) -> str:
+    for scrubber in scrubbers:
+        text = scrubber(text)
+    return text
+
+
+def _get_spec(scrubber: Callable[[str], str]) -> tuple[str, str] | None:
+    """Get regex and substitution of scrubber if it can be merged with others."""
+    if not (isinstance(scrubber, partial) and scrubber.func is scrub):
+        return None
+    regex = scrubber.keywords.get("regex")
+    sub = scrubber.keywords.get("sub")
+    if not isinstance(regex, str) or not isinstance(sub, str):
+        return None
+    # Substitutions with escapes or group references and regular expressions with
+    # backreferences can not be merged.
+    if "\\" in sub or re.search(r"\\[1-9]|\(\?P=", regex) is not None:
+        return None
+    return regex, sub
+
+
+def _merge(specs: tuple[tuple[str, str], ...]) -> Callable[[str], str]:
+    try:
+        pattern = _compile(tuple(regex for regex, _ in specs))
+    except re.error:
+        return partial(
+            _apply_sequentially,
+            scrubbers=tuple(partial(scrub, regex=r, sub=s) for r, s in specs),
+        )
+    subs = {f"_scrub{i}": sub for i, (_, sub) in enumerate(specs)}
+    return partial(_scrub_merged, pattern=pattern, subs=subs)
+
+
+@lru_cache
+def _compile(regexes: tuple[str, ...]) -> re.Pattern:
+    return re.compile(
+        "|".join(f"(?P<_scrub{i}>{regex})" for i, regex in enumerate(regexes))
+    )
+
+
+def _scrub_merged(text: str, pattern: re.Pattern, subs: dict[str, str]) -> str:
+    # The named group of the matching scrubber encloses all other groups and is
+    # therefore always the last group matched.
+    return pattern.sub(lambda match: subs[match.lastgroup], text)
@@ -1,8 +1,76 @@
-def sort_dict(dictionary: dict) -> dict:
-    result = {}
-    for k, v in sorted(dictionary.items()):
-        if isinstance(v, dict):
-            result[k] = sort_dict(v)
-        else:
-            result[k] = v
-    return result
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, Sequence
+
+
+def normalize_newlines(text: str) -> str:
+    """Translate line endings like universal newlines mode does."""
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def split_tolerance(tolerance: float | Sequence[float]) -> tuple[float, float]:
+    """Get relative and absolute tolerance. A number is used for both."""
+    if isinstance(tolerance, (int, float)):
+        return tolerance, tolerance
+    rel, abs_ = tolerance
+    return rel, abs_
+
+
+def _tmp_path(path: Path) -> Path:
+    """Temporary file next to path, unique per process and thread."""
+    return path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+@contextmanager
+def open_atomic(path: Path, mode: str = "w") -> Iterator[IO]:
+    """Open temporary file for writing and rename it to path when done.
+
+    Other processes (e.g. pytest-xdist workers) see either the previous or the
+    complete file, but never a partially written one.
+    """
+    tmp = _tmp_path(path)
+    try:
+        with open(tmp, mode) as file:
+            yield file
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def copy_atomic(src: Path, dst: Path) -> None:
+    with open(src, "rb") as source, open_atomic(dst, "wb") as destination:
+        shutil.copyfileobj(source, destination)
+
+
+def create_exclusive(path: Path, data: bytes = b"") -> bool:
+    """Create file with content if it does not exist yet, never overwriting it.
+
+    Returns False if file exists already.
+    """
+    tmp = _tmp_path(path)
+    try:
+        tmp.write_bytes(data)
+        # Linking fails if path exists, in contrast to renaming
+        os.link(tmp, path)
+    except FileExistsError:
+        return False
+    except OSError:
+        # Hard links are not supported by some file systems (e.g. FAT or some
+        # network mounts). Fall back to creating the file exclusively, which
+        # never overwrites it either, but might be seen partially written.
+        return _create_exclusive_unlinked(path, data)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return True
+
+
+def _create_exclusive_unlinked(path: Path, data: bytes) -> bool:
+    try:
+        with open(path, "xb") as file:
+            file.write(data)
+    except FileExistsError:
+        return False
+    return True
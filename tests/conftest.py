@@ -21,3 +21,16 @@ def received_path() -> Iterable[Path]:
     )
     yield path
     path.unlink(missing_ok=True)
+
+
+@pytest.fixture(autouse=True)
+def reporter_cache(monkeypatch):
+    """Do not use reporters found working by previous tests or test runs."""
+    monkeypatch.setattr("pytest_approval.main.REPORTER_CACHE", {})
+
+
+@pytest.fixture(autouse=True)
+def which(request, monkeypatch):
+    """Programs faked by pytest-subprocess are not installed. Pretend they are."""
+    if "fake_process" in request.fixturenames:
+        monkeypatch.setattr("shutil.which", lambda cmd: cmd)
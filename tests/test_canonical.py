@@ -0,0 +1,84 @@
+import copy
+
+import pytest
+
+from pytest_approval.canonical import canonicalize, default, sort
+
+
+def test_canonicalize_unchanged():
+    """Data should be returned as is if nothing needs to change."""
+    data = {"a": [1, 2], "b": {"c": "d"}}
+    assert canonicalize(data) is data
+    assert canonicalize(data, sort_arrays=True) is data
+
+
+def test_canonicalize_shares_unchanged_parts():
+    data = {"a": [2, 1], "b": {"c": ["d"]}}
+    result = canonicalize(data, sort_arrays=True)
+    assert result == {"a": [1, 2], "b": {"c": ["d"]}}
+    assert result["b"] is data["b"]
+
+
+def test_canonicalize_does_not_modify_data():
+    data = {"a": [{"b": 2.123}, {"b": 1.0}], "c": [3, 1, 2]}
+    expected = copy.deepcopy(data)
+    canonicalize(data, sort_arrays=True, precision=1)
+    assert data == expected
+
+
+def test_canonicalize_sort_arrays():
+    data = [[3, 1], {"b": 1}, {"a": 2}, "x", 1]
+    assert canonicalize(data, sort_arrays=True) == [
+        "x",
+        1,
+        [1, 3],
+        {"a": 2},
+        {"b": 1},
+    ]
+
+
+def test_canonicalize_precision():
+    data = {"a": [0.1 + 0.2, 1], "b": 2.0004}
+    assert canonicalize(data, precision=3) == {"a": [0.3, 1], "b": 2.0}
+
+
+def test_canonicalize_sets():
+    assert canonicalize({"a": {1.04, 0.01}}, precision=1) == {"a": [0.0, 1.0]}
+
+
+def test_canonicalize_deep():
+    """Deeply nested data should not hit the recursion limit."""
+    data = 1.01
+    for _ in range(100_000):
+        data = [data]
+    result = canonicalize(data, precision=1)
+    for _ in range(100_000):
+        result = result[0]
+    assert result == 1.0
+
+
+def test_canonicalize_circular():
+    data = {"a": [1.01]}
+    data["a"].append(data)
+    with pytest.raises(ValueError, match="Circular reference detected"):
+        canonicalize(data, precision=1)
+    with pytest.raises(ValueError, match="Circular reference detected"):
+        canonicalize(data, sort_arrays=True)
+
+
+def test_canonicalize_shared():
+    """Containers referenced multiple times are no circular references."""
+    shared = [2, 1]
+    assert canonicalize([shared, {"a": shared}], sort_arrays=True) == [
+        [1, 2],
+        {"a": [1, 2]},
+    ]
+
+
+def test_sort():
+    assert sort([2, 1]) == [1, 2]
+    assert sort([{"b": 1}, {"a": 1}]) == [{"a": 1}, {"b": 1}]
+
+
+def test_default():
+    assert default({"b", "a"}) == ["a", "b"]
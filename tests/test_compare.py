@@ -2,8 +2,11 @@ import pytest
 from PIL import Image, PngImagePlugin
 
 from pytest_approval.compare import (
+    compare_contents,
     compare_files,
+    compare_files_within_tolerance,
     compare_image_contents_only,
+    compare_text_within_tolerance,
 )
 
 
@@ -70,3 +73,76 @@ def test_image_compare_unequal_dimensions(images_unequal_dimensions):
     received, approved = images_unequal_dimensions
     assert compare_files(received, approved) is False
     assert compare_image_contents_only(received, approved) is False
+
+
+def test_compare_contents(tmp_path):
+    approved = tmp_path / "approved.txt"
+    approved.write_bytes(b"foo\r\nbar\n")
+    assert compare_contents("foo\nbar\n", approved) is True
+    assert compare_contents("foo\r\nbar\n", approved) is True
+    assert compare_contents("foo\n", approved) is False
+    assert compare_contents(b"foo\r\nbar\n", approved) is True
+    assert compare_contents(b"foo\nbar\n", approved) is False
+
+
+def test_compare_contents_approved_missing(tmp_path):
+    assert compare_contents("foo\n", tmp_path / "approved.txt") is False
+
+
+@pytest.mark.parametrize("chunk_size", (1, 2, 3, 1024))
+def test_compare_files_text_newlines(tmp_path, chunk_size, monkeypatch):
+    monkeypatch.setattr("pytest_approval.compare.CHUNK_SIZE", chunk_size)
+    received = tmp_path / "received.txt"
+    approved = tmp_path / "approved.txt"
+    received.write_bytes(b"foo\nbar\nbaz\n")
+    approved.write_bytes(b"foo\r\nbar\r\nbaz\n")
+    assert compare_files(received, approved) is True
+    assert compare_contents("foo\nbar\nbaz\n", approved) is True
+    approved.write_bytes(b"foo\r\nbar\r\nbaz\nqux\n")
+    assert compare_files(received, approved) is False
+    assert compare_contents("foo\nbar\nbaz\n", approved) is False
+    approved.write_bytes(b"foo\r\nbar\r\n")
+    assert compare_files(received, approved) is False
+    assert compare_contents("foo\nbar\nbaz\n", approved) is False
+
+
+@pytest.mark.parametrize("numpy_available", (True, False))
+@pytest.mark.parametrize(
+    "received, approved, expected",
+    (
+        ("x: 0.1 y: 2.0", "x: 0.1 y: 2.0", True),
+        ("x: 0.30000000000000004", "x: 0.3", True),
+        ("x: 1.0e-13, y: -1e-13", "x: 0.0, y: 0.0", True),
+        ("x: 1.5e3", "x: 1500.0", True),
+        ("x: 0.31", "x: 0.3", False),
+        ("x: 0.3", "y: 0.3", False),
+        ("x: 0.3 0.3", "x: 0.3", False),
+        # Integers and dotted numbers are compared as text
+        ("x: 1", "x: 1.0", False),
+        ("v1.2.3", "v1.2.4", False),
+        ("1.2.3", "1.2.30000000001", False),
+        ("x: inf", "x: inf", True),
+        ("x: 1e999", "x: 1e999", True),
+        ("x: 1e999", "x: 1.0", False),
+    ),
+)
+def test_compare_text_within_tolerance(
+    received, approved, expected, numpy_available, monkeypatch
+):
+    monkeypatch.setattr("pytest_approval.compare.NUMPY_AVAILABLE", numpy_available)
+    assert compare_text_within_tolerance(received, approved, 1e-9) is expected
+
+
+def test_compare_text_within_tolerance_relative_and_absolute():
+    assert compare_text_within_tolerance("1000.1", "1000.0", (1e-3, 0))
+    assert not compare_text_within_tolerance("0.1", "0.0", (1e-3, 0))
+    assert compare_text_within_tolerance("0.1", "0.0", (0, 0.2))
+
+
+def test_compare_files_within_tolerance(tmp_path):
+    received = tmp_path / "received.txt"
+    approved = tmp_path / "approved.txt"
+    received.write_text("area: 12.500000000001\n")
+    approved.write_bytes(b"area: 12.5\r\n")
+    assert compare_files_within_tolerance(received, approved, tolerance=1e-9)
+    assert not compare_files_within_tolerance(received, approved, tolerance=1e-15)
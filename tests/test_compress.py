@@ -0,0 +1,123 @@
+import gzip
+
+import pytest
+
+from pytest_approval import compress, verify, verify_stream
+from pytest_approval.compare import compare_files
+
+
+@pytest.fixture
+def compressed(tmp_path, monkeypatch):
+    monkeypatch.setattr("pytest_approval.compress.FORMAT", "gzip")
+    monkeypatch.setattr("pytest_approval.compress.THRESHOLD", 10)
+    monkeypatch.setattr("pytest_approval.compress.WRITTEN", set())
+    return tmp_path
+
+
+def test_find(compressed):
+    approved = compressed / "test_foo.py--test_bar.approved.txt"
+    assert compress.find(approved) is None
+    approved.with_name(approved.name + ".gz").write_bytes(gzip.compress(b"foo\n"))
+    assert compress.find(approved) == approved.with_name(approved.name + ".gz")
+    # Uncompressed approved takes precedence
+    approved.write_text("foo\n")
+    assert compress.find(approved) is None
+
+
+def test_compare(compressed):
+    path = compressed / "test_foo.py--test_bar.approved.txt.gz"
+    path.write_bytes(gzip.compress(b"foo\r\nbar\n"))
+    assert compress.compare_contents("foo\nbar\n", path)
+    assert not compress.compare_contents("foo\nbar\nbaz\n", path)
+    assert not compress.compare_contents("foo\n", path)
+
+    received = compressed / "test_foo.py--test_bar.received.txt"
+    received.write_text("foo\nbar\n")
+    assert compress.compare_file(received, path)
+    assert compare_files(received, path.with_suffix(""))
+    received.write_text("foo\n")
+    assert not compress.compare_file(received, path)
+
+
+def test_absorb(compressed):
+    large = compressed / "test_foo.py--test_large.approved.txt"
+    small = compressed / "test_foo.py--test_small.approved.txt"
+    large.write_text("foo\n" * 10)
+    small.write_text("foo\n")
+    compress.track(large)
+    compress.track(small)
+    compress.absorb()
+    assert set(compressed.iterdir()) == {small, large.with_name(large.name + ".gz")}
+    assert gzip.decompress(large.with_name(large.name + ".gz").read_bytes()) == (
+        b"foo\n" * 10
+    )
+
+
+def test_absorb_deterministic(compressed):
+    approved = compressed / "test_foo.py--test_bar.approved.txt"
+    approved.write_text("foo\n" * 10)
+    compress.track(approved)
+    compress.absorb()
+    content = approved.with_name(approved.name + ".gz").read_bytes()
+    compress.decompress(approved)
+    compress.absorb()
+    assert approved.with_name(approved.name + ".gz").read_bytes() == content
+
+
+def test_absorb_below_threshold(compressed):
+    """Compressed approved should be replaced if approved got smaller."""
+    approved = compressed / "test_foo.py--test_bar.approved.txt"
+    approved.with_name(approved.name + ".gz").write_bytes(gzip.compress(b"foo\n"))
+    compress.decompress(approved)
+    assert approved.read_text() == "foo\n"
+    compress.absorb()
+    assert list(compressed.iterdir()) == [approved]
+
+
+def test_binary_not_compressed(compressed):
+    approved = compressed / "test_foo.py--test_bar.approved.png"
+    approved.write_bytes(b"foo" * 10)
+    compress.track(approved)
+    compress.absorb()
+    assert list(compressed.iterdir()) == [approved]
+
+
+@pytest.fixture
+def approvals(compressed, monkeypatch):
+    monkeypatch.setattr("pytest_nodeid_to_filepath.main.ROOT_DIR", compressed)
+    monkeypatch.setattr("pytest_approval.main.APPROVALS_DIR", "")
+    monkeypatch.setattr("pytest_approval.main.AUTO_APPROVE", False)
+    monkeypatch.setenv("CI", "true")
+    directory = compressed / "tests"
+    directory.mkdir()
+    return directory
+
+
+def test_verify_compressed(approvals):
+    approved = approvals / "test_compress.py--test_verify_compressed.approved.txt"
+    compressed = approved.with_name(approved.name + ".gz")
+    compressed.write_bytes(gzip.compress(b"Hello World!\n"))
+    assert verify("Hello World!")
+    assert list(approvals.iterdir()) == [compressed]
+
+    approved = approved.with_name(
+        "test_compress.py--test_verify_compressed.2.approved.txt"
+    )
+    compressed = approved.with_name(approved.name + ".gz")
+    compressed.write_bytes(gzip.compress(b"Hello World!\n"))
+    assert not verify("Hello World?")
+    # Approved is decompressed for reporting
+    assert approved.read_text() == "Hello World!\n"
+    compress.absorb()
+    assert not approved.exists()
+    assert compressed.exists()
+
+
+def test_verify_stream_compressed(approvals):
+    approved = approvals / (
+        "test_compress.py--test_verify_stream_compressed.approved.txt"
+    )
+    compressed = approved.with_name(approved.name + ".gz")
+    compressed.write_bytes(gzip.compress(b"foo\nbar\n"))
+    assert verify_stream(iter(["foo\n", "bar\n"]))
+    assert list(approvals.iterdir()) == [compressed]
@@ -1,5 +1,8 @@
+import os
 from pathlib import Path
 
+import pytest
+
 from pytest_approval import config
 
 
@@ -13,3 +16,35 @@ def test_find_config():
 
 def test_read_config():
     assert config._read_config() == {"approvals-dir": "tests/approvals"}
+
+
+@pytest.fixture
+def pyproject(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    path.write_text('[tool.pytest-approval]\n"approvals-dir" = "approvals"\n')
+    return path
+
+
+def test_read_config_inipath(pyproject):
+    assert config._read_config(inipath=pyproject) == {"approvals-dir": "approvals"}
+
+
+def test_read_config_rootpath(pyproject):
+    rootpath = pyproject.parent
+    inipath = rootpath / "pytest.ini"
+    expected = {"approvals-dir": "approvals"}
+    assert config._read_config(rootpath=rootpath, inipath=inipath) == expected
+
+
+def test_read_config_cached(pyproject):
+    config._read_config(inipath=pyproject)
+    hits = config._parse_config.cache_info().hits
+    config._read_config(inipath=pyproject)
+    assert config._parse_config.cache_info().hits == hits + 1
+
+
+def test_read_config_cache_invalidated(pyproject):
+    config._read_config(inipath=pyproject)
+    pyproject.write_text('[tool.pytest-approval]\n"approvals-dir" = "foo"\n')
+    os.utime(pyproject, ns=(0, 0))
+    assert config._read_config(inipath=pyproject) == {"approvals-dir": "foo"}
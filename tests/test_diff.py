@@ -0,0 +1,161 @@
+import difflib
+import random
+import re
+
+import pytest
+
+from pytest_approval.diff import GREEN, RED, _find_anchor, unified_diff
+
+
+@pytest.fixture
+def files(tmp_path):
+    """Write received and approved text files."""
+
+    def write(received: str, approved: str):
+        (tmp_path / "received.txt").write_text(received)
+        (tmp_path / "approved.txt").write_text(approved)
+        return tmp_path / "received.txt", tmp_path / "approved.txt"
+
+    return write
+
+
+def expected(received: str, approved: str) -> str:
+    lines = difflib.unified_diff(
+        received.splitlines(keepends=True),
+        approved.splitlines(keepends=True),
+        fromfile="received",
+        tofile="approved",
+        lineterm="\n",
+    )
+    return "".join(lines)
+
+
+def test_unified_diff_equal(files):
+    assert unified_diff(*files("a\nb\n", "a\nb\n")) == ""
+
+
+def test_unified_diff_empty_approved(files):
+    assert unified_diff(*files("Hello World!\n", "")) == (
+        "--- received\n+++ approved\n@@ -1 +0,0 @@\n-Hello World!\n"
+    )
+
+
+def test_unified_diff_no_newline_at_end_of_file(files):
+    assert unified_diff(*files("a\nb\n", "a\nb")) == (
+        "--- received\n"
+        + "+++ approved\n"
+        + "@@ -1,2 +1,2 @@\n"
+        + " a\n"
+        + "-b\n"
+        + "+b\n"
+        + "\\ No newline at end of file\n"
+    )
+
+
+def test_unified_diff_like_difflib(files):
+    rng = random.Random(0)  # noqa: S311
+    for _ in range(100):
+        received = [rng.choice("abcde") + "\n" for _ in range(rng.randint(0, 30))]
+        approved = list(received)
+        for _ in range(rng.randint(1, 3)):
+            position = rng.randint(0, len(approved))
+            approved.insert(position, rng.choice("xyz") + "\n")
+        diff = unified_diff(*files("".join(received), "".join(approved)))
+        assert diff == expected("".join(received), "".join(approved))
+
+
+def test_unified_diff_patch(files):
+    """Applying diff to received should result in approved."""
+    rng = random.Random(0)  # noqa: S311
+    for _ in range(100):
+        received = [rng.choice("abcde") + "\n" for _ in range(rng.randint(0, 30))]
+        approved = [rng.choice("abcdef") + "\n" for _ in range(rng.randint(0, 30))]
+        diff = unified_diff(*files("".join(received), "".join(approved)))
+        assert patch(received, diff) == approved
+
+
+def patch(lines: list[str], diff: str) -> list[str]:
+    """Apply unified diff to lines."""
+    patched = []
+    position = 0
+    for line in diff.splitlines(keepends=True)[2:]:
+        if line.startswith("@@"):
+            start, length = re.match(r"@@ -(\d+),?(\d*)", line).groups()
+            # empty ranges begin at line just before the range
+            start = int(start) if length == "0" else int(start) - 1
+            patched.extend(lines[position:start])
+            position = start
+        elif line.startswith(" "):
+            patched.append(lines[position])
+            position += 1
+        elif line.startswith("-"):
+            position += 1
+        elif line.startswith("+"):
+            patched.append(line[1:])
+    return patched + lines[position:]
+
+
+def test_unified_diff_max_hunks(files):
+    received = "".join(f"{i}\n" for i in range(100))
+    approved = received.replace("10\n", "ten\n").replace("90\n", "ninety\n")
+    diff = unified_diff(*files(received, approved), max_hunks=1)
+    assert "+ten" in diff
+    assert "+ninety" not in diff
+    assert diff.endswith("... 1 more hunk(s) not shown\n")
+
+
+def test_unified_diff_max_bytes(files):
+    received = "".join(f"{i}\n" for i in range(1000))
+    diff = unified_diff(*files(received, ""), max_bytes=100)
+    assert len(diff) < 200
+    assert diff.endswith("bytes\n")
+
+
+def test_unified_diff_color(files):
+    diff = unified_diff(*files("a\n", "b\n"), color=True)
+    assert f"{RED}-a" in diff
+    assert f"{GREEN}+b" in diff
+
+
+def test_unified_diff_large(files):
+    received = [f"line {i}\n" for i in range(100_000)]
+    approved = list(received)
+    approved[50_000] = "changed\n"
+    diff = unified_diff(*files("".join(received), "".join(approved)))
+    assert diff.count("@@ ") == 1
+    assert "-line 50000\n+changed\n" in diff
+
+
+def test_unified_diff_large_reversed(files, monkeypatch):
+    """Lines unique in the whole file but outside of a region are skipped fast."""
+    calls = count_anchor_calls(monkeypatch)
+    received = [f"line {i}\n" for i in range(40_000)]
+    approved = received[::-1]
+    diff = unified_diff(*files("".join(received), "".join(approved)))
+    assert patch(received, diff) == approved
+    assert len(calls) <= 3
+
+
+def test_unified_diff_repetitive(files, monkeypatch):
+    """Work on repetitive input is limited. Regions are replaced if exceeded."""
+    monkeypatch.setattr("pytest_approval.diff.WORK_PER_LINE", 1)
+    calls = count_anchor_calls(monkeypatch)
+    rng = random.Random(0)  # noqa: S311
+    received = [f"{rng.randrange(10)}\n" for _ in range(10_000)]
+    approved = [f"{rng.randrange(10)}\n" for _ in range(10_000)]
+    diff = unified_diff(*files("".join(received), "".join(approved)))
+    assert patch(received, diff) == approved
+    # Each call examines at least one line
+    assert len(calls) <= len(received) + len(approved)
+
+
+def count_anchor_calls(monkeypatch) -> list:
+    """Record calls of `_find_anchor`: One call per region of the diff."""
+    calls = []
+
+    def find_anchor(*args):
+        calls.append(args)
+        return _find_anchor(*args)
+
+    monkeypatch.setattr("pytest_approval.diff._find_anchor", find_anchor)
+    return calls
@@ -0,0 +1,20 @@
+import subprocess
+import sys
+
+
+def test_import_optional_dependencies_lazily():
+    # Importing the plugin should not import heavy optional dependencies
+    code = (
+        "import sys; import pytest_approval.plugin; "
+        + "print(*(m for m in ('PIL', 'numpy', 'plotly') if m in sys.modules))"
+    )
+    completed_process = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code],
+        capture_output=True,
+        check=True,
+    )
+    assert completed_process.stdout.decode().strip() == ""
+
+
+def test_import_optional_dependencies_exposed():
+    from pytest_approval import verify_image_pillow, verify_plotly  # noqa: F401
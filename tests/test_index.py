@@ -0,0 +1,55 @@
+import pytest
+
+from pytest_approval import index
+
+
+@pytest.fixture
+def indexed_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr("pytest_approval.index.ROOT", None)
+    monkeypatch.setattr("pytest_approval.index.FILES", {})
+    monkeypatch.setattr("pytest_approval.index.DIRECTORIES", set())
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "foo.approved.txt").write_text("foo\n")
+    (tmp_path / "sub" / "bar.approved.txt").write_text("")
+    index.build(tmp_path)
+    return tmp_path
+
+
+def test_build(indexed_dir):
+    assert set(index.DIRECTORIES) == {indexed_dir, indexed_dir / "sub"}
+    assert set(index.FILES) == {
+        indexed_dir / "foo.approved.txt",
+        indexed_dir / "sub" / "bar.approved.txt",
+    }
+    assert index.FILES[indexed_dir / "foo.approved.txt"].size == 4
+    assert index.FILES[indexed_dir / "sub" / "bar.approved.txt"].size == 0
+
+
+def test_lookup_without_filesystem(indexed_dir):
+    path = indexed_dir / "foo.approved.txt"
+    path.unlink()  # index is not aware of the removal
+    assert index.exists(path)
+
+
+def test_lookup_not_indexed(indexed_dir):
+    # Files created outside of pytest-approval are looked up on the filesystem
+    path = indexed_dir / "new.approved.txt"
+    assert not index.exists(path)
+    path.write_text("new\n")
+    assert index.exists(path)
+    assert path in index.FILES
+
+
+def test_record_and_discard(indexed_dir):
+    path = indexed_dir / "foo.approved.txt"
+    path.write_text("foo bar\n")
+    assert index.record(path).size == 8
+    index.discard(path)
+    assert path not in index.FILES
+
+
+def test_mkdir(indexed_dir):
+    path = indexed_dir / "new" / "dir"
+    index.mkdir(path)
+    assert path.is_dir()
+    assert path in index.DIRECTORIES
@@ -0,0 +1,79 @@
+import json
+
+from pytest_approval.json_diff import differences, first_difference, pointer_diff
+
+
+def test_differences_equal():
+    document = {"a": [1, {"b": None}], "c": "d"}
+    assert list(differences(document, json.loads(json.dumps(document)))) == []
+
+
+def test_differences_key_order():
+    assert first_difference({"a": 1, "b": 2}, {"b": 2, "a": 1}) is None
+
+
+def test_differences_numbers():
+    assert first_difference(1, 1.0) is None
+    assert first_difference(float("nan"), float("nan")) is None
+    assert first_difference(True, 1) == ("", True, 1)
+    assert first_difference(0, False) == ("", 0, False)
+
+
+def test_differences_tolerance():
+    received = {"a": 0.1 + 0.2, "b": 1, "c": 2.0, "d": True}
+    approved = {"a": 0.3, "b": 1.0000000001, "c": 3, "d": 1.0}
+    assert list(differences(received, approved, tolerance=1e-9)) == [
+        ("/c", 2.0, 3),
+        ("/d", True, 1.0),
+    ]
+    assert first_difference(received, approved)[0] == "/a"
+
+
+def test_differences_document_order():
+    received = {"a": [1, 2, 3], "b": {"c": 1}, "d": 1}
+    approved = {"a": [1, 5], "b": {"c": 2, "e": 3}}
+    assert [pointer for pointer, _, _ in differences(received, approved)] == [
+        "/a/1",
+        "/a/2",
+        "/b/c",
+        "/b/e",
+        "/d",
+    ]
+
+
+def test_differences_escape():
+    assert first_difference({"a/b~": 1}, {"a/b~": 2})[0] == "/a~1b~0"
+
+
+def test_differences_deep():
+    """Deeply nested documents should not hit the recursion limit."""
+    received = approved = 1
+    for _ in range(10_000):
+        received, approved = [received], [approved]
+    assert first_difference(received, approved) is None
+
+
+def test_pointer_diff():
+    received = {"features": [{"area": 12.5}, {"type": "Feature"}]}
+    approved = {"features": [{"area": 12.6}]}
+    assert pointer_diff(received, approved) == (
+        "--- received\n"
+        + "+++ approved\n"
+        + "/features/0/area: 12.5 -> 12.6\n"
+        + '/features/1: {"type": "Feature"} -> (missing)\n'
+    )
+
+
+def test_pointer_diff_root():
+    assert pointer_diff([], {}) == "--- received\n+++ approved\n/: [] -> {}\n"
+
+
+def test_pointer_diff_max_differences():
+    diff = pointer_diff(list(range(10)), [], max_differences=2)
+    assert diff.endswith("/1: 1 -> (missing)\n... more differences not shown\n")
+
+
+def test_pointer_diff_long_value():
+    diff = pointer_diff("a" * 1000, None)
+    assert len(diff) < 200
+    assert "aaa... -> null" in diff
@@ -0,0 +1,95 @@
+import copy
+
+import pytest
+
+from pytest_approval.json_path import (
+    WILDCARD,
+    InvalidPathError,
+    Step,
+    compile_path,
+    scrub,
+)
+from pytest_approval.scrub import get_datetime_scrubber
+
+
+def test_compile_path():
+    assert compile_path("$") == ()
+    assert compile_path("$.items[*].id") == (
+        Step("items"),
+        Step(WILDCARD),
+        Step("id"),
+    )
+    assert compile_path("$['a.b'][\"c\"][-1].*") == (
+        Step("a.b"),
+        Step("c"),
+        Step(-1),
+        Step(WILDCARD),
+    )
+    assert compile_path("$..created_at..[0]..*") == (
+        Step("created_at", descendant=True),
+        Step(0, descendant=True),
+        Step(WILDCARD, descendant=True),
+    )
+
+
+def test_compile_path_cached():
+    assert compile_path("$.a.b") is compile_path("$.a.b")
+
+
+@pytest.mark.parametrize("path", ["", "a.b", "$.", "$..", "$[a]", "$...a", "$.a["])
+def test_compile_path_invalid(path):
+    with pytest.raises(InvalidPathError):
+        compile_path(path)
+
+
+def test_scrub_wildcard():
+    data = {"items": [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]}
+    assert scrub(data, {"$.items[*].id": "{{ID}}"}) == {
+        "items": [{"id": "{{ID}}", "name": "a"}, {"id": "{{ID}}", "name": "b"}]
+    }
+
+
+def test_scrub_index():
+    data = {"a": [1, 2, 3], "b": {"0": 1}}
+    assert scrub(data, {"$.a[0]": 0, "$.a[-1]": 0, "$.b[0]": 0}) == {
+        "a": [0, 2, 0],
+        "b": {"0": 1},
+    }
+
+
+def test_scrub_recursive_descent():
+    data = {"id": 1, "a": [{"id": 2, "b": {"id": 3}}], "c": "id"}
+    assert scrub(data, {"$..id": None}) == {
+        "id": None,
+        "a": [{"id": None, "b": {"id": None}}],
+        "c": "id",
+    }
+
+
+def test_scrub_root():
+    assert scrub({"a": 1}, {"$": "{{ROOT}}"}) == "{{ROOT}}"
+
+
+def test_scrub_no_match():
+    data = {"a": [1, 2]}
+    assert scrub(data, {"$.b": 0, "$.a[5]": 0}) is data
+
+
+def test_scrub_does_not_modify_data():
+    data = {"a": [{"id": 1}, {"id": 2}], "b": {"c": [1]}}
+    expected = copy.deepcopy(data)
+    result = scrub(data, {"$.a[*].id": 0})
+    assert data == expected
+    assert result["b"] is data["b"]
+
+
+def test_scrub_first_path_wins():
+    assert scrub({"a": 1}, {"$.a": "first", "$..a": "second"}) == {"a": "first"}
+
+
+def test_scrub_callable():
+    scrubber = get_datetime_scrubber("2024-01-01T00:00:00+00:00")
+    data = {"events": [{"created_at": "2024-05-13T16:30:00+02:00", "n": 1}]}
+    assert scrub(data, {"$..created_at": scrubber}) == {
+        "events": [{"created_at": "{{DATETIME}}", "n": 1}]
+    }
@@ -0,0 +1,65 @@
+from pathlib import Path
+
+import pytest
+
+from pytest_approval import layout
+
+
+@pytest.mark.parametrize(
+    ("flat", "per_module"),
+    (
+        (
+            "approvals/test_foo.py--test_bar.approved.txt",
+            "approvals/test_foo.py/test_bar.approved.txt",
+        ),
+        (
+            "approvals/test_foo.py--TestFoo--test_bar[1].approved.txt",
+            "approvals/test_foo.py/TestFoo--test_bar[1].approved.txt",
+        ),
+        (
+            "approvals/sub/test_foo.py--test_bar.received.json",
+            "approvals/sub/test_foo.py/test_bar.received.json",
+        ),
+    ),
+)
+def test_apply_and_flatten(flat, per_module):
+    assert layout.apply(Path(flat), layout.PER_MODULE) == Path(per_module)
+    assert layout.flatten(Path(per_module), layout.PER_MODULE) == Path(flat)
+    assert layout.apply(Path(flat), layout.FLAT) == Path(flat)
+    assert layout.flatten(Path(flat), layout.FLAT) == Path(flat)
+
+
+def test_migrate(tmp_path):
+    files = {
+        "test_foo.py--test_foo.approved.txt": "foo",
+        "test_foo.py--test_bar.approved.png": "bar",
+        "sub/test_baz.py--test_baz.approved.txt": "baz",
+        "test_foo.py.approved.pack": "pack",
+        ".approval-manifest": "{}",
+    }
+    for name, content in files.items():
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text(content)
+
+    moved = layout.migrate(tmp_path, layout.PER_MODULE)
+    assert len(moved) == 3
+    assert (tmp_path / "test_foo.py" / "test_foo.approved.txt").read_text() == "foo"
+    assert (tmp_path / "test_foo.py" / "test_bar.approved.png").read_text() == "bar"
+    assert (tmp_path / "sub" / "test_baz.py" / "test_baz.approved.txt").exists()
+    assert (tmp_path / "test_foo.py.approved.pack").exists()
+    assert layout.migrate(tmp_path, layout.PER_MODULE) == []
+
+    moved = layout.migrate(tmp_path, layout.FLAT)
+    assert len(moved) == 3
+    assert {str(p.relative_to(tmp_path)) for p in tmp_path.rglob("*")} == {
+        *files,
+        "sub",
+    }
+
+
+def test_migrate_destination_exists(tmp_path):
+    (tmp_path / "test_foo.py--test_foo.approved.txt").write_text("flat")
+    (tmp_path / "test_foo.py").mkdir()
+    (tmp_path / "test_foo.py" / "test_foo.approved.txt").write_text("per-module")
+    assert layout.migrate(tmp_path, layout.PER_MODULE) == []
+    assert (tmp_path / "test_foo.py--test_foo.approved.txt").read_text() == "flat"
@@ -1,11 +1,12 @@
 import logging
 import os
 import re
+from functools import partial
 from pathlib import Path
 
 import pytest
 
-from pytest_approval import scrub, verify, verify_json
+from pytest_approval import index, main, scrub, verify, verify_json
 from pytest_approval.definitions import REPORTERS
 
 FIXTURE_DIR = Path(__file__).parent / "fixtures"
@@ -50,6 +51,19 @@ def test_verify_string_scrub_multiple():
     )
 
 
+def test_scrub_sequential():
+    """Scrubbers of a tuple are applied one after another."""
+    scrub_digits = partial(scrub.scrub, regex=r"\d+", sub="N")
+    scrub_id = partial(scrub.scrub, regex="idN", sub="ID")
+    assert main._scrub("id42", (scrub_digits, scrub_id)) == "ID"
+    scrub_time = scrub.get_datetime_scrubber("23:30:00")
+    scrub_datetime = scrub.get_datetime_scrubber("2023-07-16 17:39:03.293919")
+    assert (
+        main._scrub("at 2023-07-16 17:39:03.293919 done", (scrub_time, scrub_datetime))
+        == "at 2023-07-16 {{DATETIME}}.293919 done"
+    )
+
+
 def test_verify_multiple_calls():
     """Test multiple calls to verify. File names should be numbered."""
     assert verify("foo")
@@ -240,3 +254,80 @@ def test_verify_ci(monkeypatch, capsys: pytest.CaptureFixture):
     replacement = r"\t\1"
     error_text = re.sub(pattern, replacement, stdout, flags=re.MULTILINE)
     assert verify(error_text)
+
+
+@pytest.mark.usefixtures("approved_file_different")
+def test_verify_reporter_cache(fake_process, monkeypatch):
+    """Once a working reporter is found it should be used first."""
+    monkeypatch.setattr("pytest_approval.main.AUTO_APPROVE", False)
+    monkeypatch.delenv("CI", raising=False)
+    fake_process.register_subprocess(["meld", fake_process.any()], returncode=127)
+    fake_process.register_subprocess(
+        ["pycharm", fake_process.any()],
+        returncode=0,
+        occurrences=2,
+    )
+    assert verify("Hello World!") is False
+    assert verify("Hello World!") is False
+    assert fake_process.call_count(["meld", fake_process.any()]) == 1
+    assert fake_process.call_count(["pycharm", fake_process.any()]) == 2
+
+
+def test_verify_reporter_not_installed(fake_process, monkeypatch):
+    """Programs which are not installed should not be run."""
+    monkeypatch.setattr("pytest_approval.main.AUTO_APPROVE", False)
+    monkeypatch.delenv("CI", raising=False)
+    monkeypatch.setattr("shutil.which", lambda cmd: None if cmd == "meld" else cmd)
+    fake_process.register_subprocess(["meld", fake_process.any()])
+    fake_process.register_subprocess(["pycharm", fake_process.any()], returncode=0)
+    assert verify("Hello World!") is False
+    assert fake_process.call_count(["meld", fake_process.any()]) == 0
+    assert fake_process.call_count(["pycharm", fake_process.any()]) == 1
+
+
+@pytest.fixture
+def deferred(monkeypatch):
+    monkeypatch.setattr("pytest_approval.main.AUTO_APPROVE", False)
+    monkeypatch.setattr("pytest_approval.main.REPORT_DEFERRED", True)
+    monkeypatch.setattr("pytest_approval.main.DEFERRED_REPORTS", [])
+    monkeypatch.delenv("CI", raising=False)
+
+
+@pytest.mark.usefixtures("approved_file_different", "deferred")
+def test_verify_deferred_batch(fake_process):
+    fake_process.register_subprocess(["meld", fake_process.any()])
+    assert verify("Hello World!") is False
+    assert verify("foo") is False
+    assert fake_process.call_count(["meld", fake_process.any()]) == 0
+    main.report_deferred()
+    assert fake_process.call_count(["meld", fake_process.any()]) == 1
+    command = fake_process.calls[0]
+    assert command[0] == "meld"
+    assert command[1::3] == ["--diff", "--diff"]
+    assert len(command) == 7
+    assert main.DEFERRED_REPORTS == []
+
+
+@pytest.mark.usefixtures("approved_file_different", "deferred")
+def test_verify_deferred_no_batch(fake_process, monkeypatch):
+    monkeypatch.setattr("shutil.which", lambda cmd: None if cmd == "meld" else cmd)
+    fake_process.register_subprocess(["pycharm", fake_process.any()], occurrences=2)
+    assert verify("Hello World!") is False
+    assert verify("foo") is False
+    main.report_deferred()
+    assert fake_process.call_count(["pycharm", fake_process.any()]) == 2
+
+
+def test_remove_stale_received(tmp_path, monkeypatch):
+    monkeypatch.setattr("pytest_approval.index.ROOT", None)
+    monkeypatch.setattr("pytest_approval.index.FILES", {})
+    monkeypatch.setattr("pytest_approval.index.DIRECTORIES", set())
+    (tmp_path / "test_foo.py").mkdir()
+    approved = tmp_path / "test_foo.py--test_bar.approved.txt"
+    approved.write_text("foo\n")
+    (tmp_path / "test_foo.py--test_bar.received.txt").write_text("bar\n")
+    (tmp_path / "test_foo.py" / "test_baz.2.received.png").write_bytes(b"")
+    index.build(tmp_path)
+    main.remove_stale_received()
+    assert list(tmp_path.rglob("*.*.*")) == [approved]
+    assert list(index.FILES) == [approved]
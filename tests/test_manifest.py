@@ -0,0 +1,110 @@
+import pytest
+
+from pytest_approval import index, manifest
+from pytest_approval.compare import compare_contents, compare_files
+
+
+@pytest.fixture
+def approvals_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr("pytest_approval.index.ROOT", None)
+    monkeypatch.setattr("pytest_approval.index.FILES", {})
+    monkeypatch.setattr("pytest_approval.index.DIRECTORIES", set())
+    monkeypatch.setattr("pytest_approval.manifest.ROOT", None)
+    monkeypatch.setattr("pytest_approval.manifest.ENTRIES", {})
+    monkeypatch.setattr("pytest_approval.manifest.CHANGED", set())
+    (tmp_path / "foo.approved.txt").write_text("foo\n")
+    index.build(tmp_path)
+    manifest.load(tmp_path)
+    return tmp_path
+
+
+def test_digest_universal_newlines():
+    assert manifest.digest("foo\r\nbar\n") == manifest.digest("foo\nbar\n")
+    assert manifest.digest(b"foo\r\nbar\n") != manifest.digest(b"foo\nbar\n")
+
+
+def test_compare_digest_unknown(approvals_dir):
+    approved = approvals_dir / "foo.approved.txt"
+    assert manifest.compare_digest("foo\n", approved) is None
+
+
+def test_compare_contents_records_digest(approvals_dir):
+    approved = approvals_dir / "foo.approved.txt"
+    assert compare_contents("foo\n", approved)
+    assert manifest.compare_digest("foo\n", approved) is True
+    assert manifest.compare_digest("bar\n", approved) is False
+
+
+def test_compare_contents_skips_reading_approved(approvals_dir, monkeypatch):
+    approved = approvals_dir / "foo.approved.txt"
+    manifest.record(approved, "foo\n")
+    monkeypatch.setattr("pathlib.Path.read_text", None)
+    assert compare_contents("foo\n", approved)
+    assert not compare_contents("bar\n", approved)
+
+
+def test_compare_digest_approved_modified(approvals_dir):
+    approved = approvals_dir / "foo.approved.txt"
+    manifest.record(approved, "foo\n")
+    approved.write_text("bar bar\n")
+    index.record(approved)
+    assert manifest.compare_digest("foo\n", approved) is None
+    assert compare_contents("bar bar\n", approved)
+
+
+def test_compare_files_records_digest(approvals_dir):
+    approved = approvals_dir / "foo.approved.txt"
+    received = approvals_dir / "foo.received.txt"
+    received.write_text("foo\n")
+    assert compare_files(received, approved)
+    assert manifest.compare_digest("foo\n", approved) is True
+
+
+def test_compare_files_reads_received_once(approvals_dir, monkeypatch):
+    approved = approvals_dir / "foo.approved.txt"
+    received = approvals_dir / "foo.received.txt"
+    received.write_bytes(b"foo\r\n")
+    monkeypatch.setattr("pathlib.Path.read_text", None)
+    assert compare_files(received, approved)
+    assert manifest.compare_digest("foo\n", approved) is True
+
+
+def test_compare_files_binary_records_digest(approvals_dir):
+    approved = approvals_dir / "foo.approved.png"
+    received = approvals_dir / "foo.received.png"
+    approved.write_bytes(b"foo\r\n")
+    index.record(approved)
+    received.write_bytes(b"foo\r\n")
+    assert compare_files(received, approved)
+    assert manifest.compare_digest(b"foo\r\n", approved) is True
+    assert manifest.compare_digest(b"foo\n", approved) is False
+
+
+def test_save_and_load(approvals_dir):
+    approved = approvals_dir / "foo.approved.txt"
+    manifest.record(approved, "foo\n")
+    manifest.save()
+    assert (approvals_dir / manifest.FILENAME).exists()
+    manifest.load(approvals_dir)
+    assert manifest.compare_digest("foo\n", approved) is True
+
+
+def test_load_invalid(approvals_dir):
+    (approvals_dir / manifest.FILENAME).write_text("[1, 2")
+    manifest.load(approvals_dir)
+    assert manifest.ENTRIES == {}
+
+
+def test_pop_changes_and_merge(approvals_dir):
+    approved = approvals_dir / "foo.approved.txt"
+    manifest.record(approved, "foo\n")
+    changes = manifest.pop_changes()
+    assert set(changes) == {"foo.approved.txt"}
+    manifest.save()  # Changes have been popped: nothing to save
+    assert not (approvals_dir / manifest.FILENAME).exists()
+
+    # e.g. on pytest-xdist controller
+    manifest.merge({k: list(v) for k, v in changes.items()})
+    assert manifest.compare_digest("foo\n", approved) is True
+    manifest.save()
+    assert (approvals_dir / manifest.FILENAME).exists()
@@ -0,0 +1,110 @@
+import pytest
+
+from pytest_approval import orphans, pack
+
+
+@pytest.fixture
+def directory(tmp_path, monkeypatch):
+    monkeypatch.setattr("pytest_approval.orphans.DIRECTORY", tmp_path)
+    monkeypatch.setattr("pytest_approval.orphans.USED", set())
+    monkeypatch.setattr("pytest_approval.orphans.PROTECTED", set())
+    monkeypatch.setattr("pytest_approval.orphans.HASHED", set())
+    monkeypatch.setattr("pytest_approval.orphans.PARTIAL", False)
+    return tmp_path
+
+
+def test_find(directory):
+    used = directory / "test_foo.py--test_used.approved.txt"
+    orphan = directory / "test_foo.py--test_renamed.approved.txt"
+    for path in (used, orphan):
+        path.write_text("foo\n")
+    (directory / "test_foo.py--test_used.received.txt").write_text("bar\n")
+    (directory / ".approval-manifest").write_text("{}")
+    orphans.use(used)
+    assert orphans.find() == [orphan]
+
+
+def test_find_count(directory):
+    """Approved files of further calls to verify not made anymore are orphans."""
+    first = directory / "test_foo.py--test_bar.approved.txt"
+    second = directory / "test_foo.py--test_bar.2.approved.txt"
+    for path in (first, second):
+        path.write_text("foo\n")
+    orphans.use(first)
+    assert orphans.find() == [second]
+
+
+def test_find_protected(directory):
+    """Approved files of tests which did not pass are not orphans."""
+    paths = [
+        directory / "test_foo.py--test_bar.approved.txt",
+        directory / "test_foo.py--test_bar.2.approved.txt",
+        directory / "test_foo.py--test_bar.shard-0.approved.txt",
+        directory / "test_foo.py--test_bar[1.5].approved.txt",
+    ]
+    for path in paths:
+        path.write_text("foo\n")
+    orphans.protect(directory / "test_foo.py--test_bar")
+    assert orphans.find() == [paths[3]]
+
+
+def test_find_hashed(directory):
+    """Approved files with any hashed parameter ID of a test with one are kept."""
+    paths = [
+        directory / "test_foo.py--test_bar[394768595].approved.txt",
+        directory / "test_foo.py--test_bar[394768595].2.approved.txt",
+        directory / "test_foo.py--test_bar[1].approved.txt",
+        directory / "test_foo.py--test_bar[a].approved.txt",
+        directory / "test_foo.py--test_baz[394768595].approved.txt",
+    ]
+    for path in paths:
+        path.write_text("foo\n")
+    orphans.use(paths[2])
+    orphans.protect_hashed(directory / "test_foo.py--test_bar[1397050322]")
+    assert orphans.find() == [paths[3], paths[4]]
+
+
+def test_find_compressed(directory):
+    approved = directory / "test_foo.py--test_bar.approved.txt"
+    approved.with_name(approved.name + ".gz").write_bytes(b"")
+    assert orphans.find() == [approved.with_name(approved.name + ".gz")]
+    orphans.use(approved)
+    assert orphans.find() == []
+
+
+def test_find_and_prune_packed(directory, monkeypatch):
+    monkeypatch.setattr("pytest_approval.pack.PACKS", {})
+    monkeypatch.setattr("pytest_approval.pack.CHANGES", {})
+    used = directory / "test_foo.py--test_used.approved.txt"
+    orphan = directory / "test_foo.py--test_renamed.approved.txt"
+    pack.put(used, b"foo\n")
+    pack.put(orphan, b"bar\n")
+    pack.save()
+    orphans.use(used)
+    assert orphans.find() == [orphan]
+    orphans.prune([orphan])
+    pack.clear()
+    assert pack.get(used) == b"foo\n"
+    assert pack.get(orphan) is None
+    pack.clear()
+
+
+def test_prune(directory):
+    orphan = directory / "test_foo.py--test_renamed.approved.txt"
+    orphan.write_text("foo\n")
+    orphans.prune(orphans.find())
+    assert list(directory.iterdir()) == []
+
+
+def test_merge(directory):
+    orphans.use(directory / "foo.approved.txt")
+    orphans.protect_hashed(directory / "foo[394768595]")
+    orphans.PARTIAL = True
+    state = orphans.pop_state()
+    assert not orphans.USED
+    assert not orphans.HASHED
+    assert not orphans.PARTIAL
+    orphans.merge(state)
+    assert {directory / "foo.approved.txt"} == orphans.USED
+    assert {directory / "foo"} == orphans.HASHED
+    assert orphans.PARTIAL
@@ -0,0 +1,101 @@
+import pytest
+
+from pytest_approval import pack, verify
+
+
+@pytest.fixture
+def packed(tmp_path, monkeypatch):
+    monkeypatch.setattr("pytest_approval.pack.ENABLED", True)
+    monkeypatch.setattr("pytest_approval.pack.PACKS", {})
+    monkeypatch.setattr("pytest_approval.pack.CHANGES", {})
+    monkeypatch.setattr("pytest_approval.pack.MATERIALIZED", set())
+    yield tmp_path
+    pack.clear()
+
+
+def test_get_pack_path(tmp_path):
+    approved = tmp_path / "test_foo.py--test_bar[1].approved.txt"
+    assert pack.get_pack_path(approved) == tmp_path / "test_foo.py.approved.pack"
+
+
+def test_is_packed(packed):
+    assert pack.is_packed(packed / "test_foo.py--test_bar.approved.txt")
+    assert not pack.is_packed(packed / "test_foo.py--test_bar.approved.png")
+
+
+def test_save_and_get(packed):
+    foo = packed / "test_foo.py--test_foo.approved.txt"
+    bar = packed / "test_foo.py--test_bar.approved.json"
+    pack.put(foo, b"foo\n")
+    pack.put(bar, b"{}\n")
+    pack.save()
+    assert set(packed.iterdir()) == {packed / "test_foo.py.approved.pack"}
+
+    pack.clear()
+    assert pack.get(foo) == b"foo\n"
+    assert pack.get(bar) == b"{}\n"
+    assert pack.get(packed / "test_foo.py--test_baz.approved.txt") is None
+    assert pack.compare_contents("foo\n", foo)
+    assert not pack.compare_contents("bar\n", foo)
+    assert pack.compare_contents("foo\r\n", foo)
+
+
+def test_save_remove(packed):
+    foo = packed / "test_foo.py--test_foo.approved.txt"
+    pack.put(foo, b"foo\n")
+    pack.save()
+    pack.put(foo, None)
+    pack.save()
+    assert pack.get(foo) is None
+    # Empty packs are removed
+    assert list(packed.iterdir()) == []
+
+
+def test_materialize_and_absorb(packed):
+    foo = packed / "test_foo.py--test_foo.approved.txt"
+    pack.put(foo, b"foo\n")
+    pack.save()
+    pack.materialize(foo)
+    assert foo.read_text() == "foo\n"
+    foo.write_text("bar\n")  # e.g. approved by reporter
+    pack.absorb()
+    pack.save()
+    assert not foo.exists()
+    assert pack.get(foo) == b"bar\n"
+
+
+def test_absorb_existing_file(packed):
+    """Existing approved files should be moved into pack (migration)."""
+    foo = packed / "test_foo.py--test_foo.approved.txt"
+    foo.write_text("foo\n")
+    pack.materialize(foo)
+    assert foo.read_text() == "foo\n"
+    pack.absorb()
+    pack.save()
+    assert not foo.exists()
+    assert pack.get(foo) == b"foo\n"
+
+
+def test_invalid_pack(packed):
+    (packed / "test_foo.py.approved.pack").write_text("foo\nbar\n")
+    with pytest.raises(pack.InvalidPackError):
+        pack.get(packed / "test_foo.py--test_foo.approved.txt")
+
+
+def test_verify_packed(packed, monkeypatch):
+    monkeypatch.setattr("pytest_nodeid_to_filepath.main.ROOT_DIR", packed)
+    monkeypatch.setattr("pytest_approval.main.APPROVALS_DIR", "")
+    monkeypatch.setattr("pytest_approval.main.AUTO_APPROVE", False)
+    monkeypatch.setenv("CI", "true")
+    approved = packed / "tests" / "test_pack.py--test_verify_packed.approved.txt"
+    pack.put(approved, b"Hello World!\n")
+    assert verify("Hello World!")
+    assert not approved.exists()
+
+    approved = approved.with_name("test_pack.py--test_verify_packed.2.approved.txt")
+    pack.put(approved, b"Hello World!\n")
+    assert not verify("Hello World?")
+    # Approved is materialized for reporting
+    assert approved.read_text() == "Hello World!\n"
+    pack.absorb()
+    assert not approved.exists()
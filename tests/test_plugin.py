@@ -0,0 +1,60 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+from pytest_approval import main, manifest, plugin
+from pytest_approval.compare import (
+    compare_files_within_tolerance,
+    compare_image_contents_only,
+)
+
+
+def test_pytest_testnodedown(monkeypatch):
+    """Output of pytest-xdist workers should be merged into controller."""
+    monkeypatch.setattr("pytest_approval.main.DEFERRED_REPORTS", [])
+    monkeypatch.setattr("pytest_approval.manifest.ENTRIES", {})
+    monkeypatch.setattr("pytest_approval.manifest.CHANGED", set())
+    node = SimpleNamespace(
+        workeroutput={
+            plugin.REPORTS_KEY: [
+                (
+                    "foo.received.png",
+                    "foo.approved.png",
+                    "compare_image_contents_only",
+                    {},
+                ),
+                (
+                    "bar.received.txt",
+                    "bar.approved.txt",
+                    "compare_files_within_tolerance",
+                    {"tolerance": 1e-9},
+                ),
+            ],
+            plugin.MANIFEST_KEY: {"foo.approved.txt": [4, 0, "digest"]},
+            plugin.REPORTER_CACHE_KEY: {"key": ["meld", "%received", "%approved"]},
+        }
+    )
+    plugin.pytest_testnodedown(node, None)
+    assert list(main.DEFERRED_REPORTS[:1]) == [
+        (
+            Path("foo.received.png"),
+            Path("foo.approved.png"),
+            compare_image_contents_only,
+        )
+    ]
+    *_, compare = main.DEFERRED_REPORTS[1]
+    assert compare.func is compare_files_within_tolerance
+    assert compare.keywords == {"tolerance": 1e-9}
+    assert manifest.ENTRIES == {"foo.approved.txt": (4, 0, "digest")}
+    assert main.REPORTER_CACHE == {"key": ["meld", "%received", "%approved"]}
+
+
+def test_pytest_testnodedown_crashed():
+    """Crashed pytest-xdist workers have no output."""
+    plugin.pytest_testnodedown(SimpleNamespace(), "error")
+
+
+def test_has_hashed_id():
+    assert not plugin._has_hashed_id("tests/test_foo.py::test_bar")
+    assert not plugin._has_hashed_id("tests/test_foo.py::test_bar[1.5-a b]")
+    assert plugin._has_hashed_id("tests/test_foo.py::test_bar[(id:(node/1))]")
+    assert plugin._has_hashed_id(f"tests/test_foo.py::test_bar[{'a' * 41}]")
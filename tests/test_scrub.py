@@ -1,3 +1,6 @@
+import re
+from functools import partial
+
 import pytest
 from hypothesis import given, strategies
 
@@ -51,3 +54,75 @@ def test_scrub_datetime_not_found(example):
 def test_scrub_uuid(uuid):
     scrub_uuid = scrub.get_uuid_scrubber()
     assert scrub_uuid(f"prefix {uuid} postfix") == "prefix {{UUID}} postfix"
+
+
+def test_compose_scrubbers():
+    scrub_composed = scrub.compose_scrubbers(
+        scrub.get_uuid_scrubber(),
+        scrub.get_datetime_scrubber("2020-02-02"),
+        scrub.get_datetime_scrubber("23:30:00"),
+    )
+    text = "27de4925-c261-4e8f-973d-74213004b27d at 2020-02-02 23:30:00\n"
+    assert scrub_composed(text) == "{{UUID}} at {{DATETIME}} {{DATETIME}}\n"
+
+
+def test_compose_scrubbers_merged():
+    scrub_composed = scrub.compose_scrubbers(
+        scrub.get_uuid_scrubber(),
+        scrub.get_datetime_scrubber("2020-02-02"),
+    )
+    # A single pass over the text with one precompiled regular expression
+    assert scrub_composed.func is scrub._scrub_merged
+    assert isinstance(scrub_composed.keywords["pattern"], re.Pattern)
+
+
+def test_compose_scrubbers_callables():
+    scrub_composed = scrub.compose_scrubbers(
+        scrub.get_uuid_scrubber(),
+        str.upper,
+        scrub.get_datetime_scrubber("2020-02-02", sub="{{date}}"),
+    )
+    text = "27de4925-c261-4e8f-973d-74213004b27d at 2020-02-02"
+    assert scrub_composed(text) == "{{UUID}} AT {{date}}"
+
+
+def test_compose_scrubbers_not_mergeable():
+    scrub_composed = scrub.compose_scrubbers(
+        partial(scrub.scrub, regex=r"(a)\1", sub="b"),
+        partial(scrub.scrub, regex=r"(c)", sub=r"\1\1"),
+    )
+    assert scrub_composed("aa c") == "b cc"
+
+
+@given(strategies.uuids(), strategies.datetimes())
+def test_compose_scrubbers_equal_to_sequential(uuid, datetime):
+    scrubbers = (
+        scrub.get_uuid_scrubber(),
+        scrub.get_datetime_scrubber("2023-07-16 17:39:03.293919"),
+    )
+    text = f"prefix {uuid} and {datetime} postfix"
+    expected = text
+    for s in scrubbers:
+        expected = s(expected)
+    assert scrub.compose_scrubbers(*scrubbers)(text) == expected
+
+
+@pytest.mark.parametrize("example", datetime_text_exmaples)
+def test_scrub_all_datetimes(example: str):
+    scrub_datetimes = scrub.get_all_datetimes_scrubber()
+    text = f"prefix {example} postfix"
+    assert scrub_datetimes(text) == "prefix {{DATETIME}} postfix"
+
+
+def test_scrub_all_datetimes_multiple():
+    scrub_datetimes = scrub.get_all_datetimes_scrubber(sub="X")
+    text = "2020-02-02, 23:30:00 and Wed Dec 11 14:59:44 2024\n20250527_125703"
+    assert scrub_datetimes(text) == "X, X and X\nX"
+
+
+def test_get_scrubber_memoized():
+    assert scrub.get_datetime_scrubber("2020-02-02") is scrub.get_datetime_scrubber(
+        "2020-02-02"
+    )
+    assert scrub.get_uuid_scrubber() is scrub.get_uuid_scrubber()
+    assert scrub.get_uuid_scrubber() is not scrub.get_uuid_scrubber(sub="foo")
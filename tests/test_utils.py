@@ -0,0 +1,60 @@
+import pytest
+
+from pytest_approval.utils import copy_atomic, create_exclusive, open_atomic
+
+
+def test_open_atomic(tmp_path):
+    path = tmp_path / "foo.txt"
+    path.write_text("old")
+    with open_atomic(path) as file:
+        file.write("new")
+        # Previous content is untouched until writing is done
+        assert path.read_text() == "old"
+    assert path.read_text() == "new"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_open_atomic_error(tmp_path):
+    path = tmp_path / "foo.txt"
+    path.write_text("old")
+    with pytest.raises(ValueError), open_atomic(path) as file:
+        file.write("new")
+        raise ValueError()
+    assert path.read_text() == "old"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_copy_atomic(tmp_path):
+    (tmp_path / "src.png").write_bytes(b"foo")
+    copy_atomic(tmp_path / "src.png", tmp_path / "dst.png")
+    assert (tmp_path / "dst.png").read_bytes() == b"foo"
+
+
+def test_create_exclusive(tmp_path):
+    path = tmp_path / "foo.png"
+    assert create_exclusive(path, b"foo")
+    assert path.read_bytes() == b"foo"
+
+
+def test_create_exclusive_exists(tmp_path):
+    """Existing file should never be overwritten."""
+    path = tmp_path / "foo.txt"
+    path.write_text("approved")
+    assert not create_exclusive(path)
+    assert path.read_text() == "approved"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_create_exclusive_no_hard_links(tmp_path, monkeypatch):
+    """File systems without hard links should fall back to exclusive creation."""
+
+    def link(src, dst):
+        raise PermissionError(1, "Operation not permitted")
+
+    monkeypatch.setattr("os.link", link)
+    path = tmp_path / "foo.png"
+    assert create_exclusive(path, b"foo")
+    assert path.read_bytes() == b"foo"
+    assert not create_exclusive(path, b"bar")
+    assert path.read_bytes() == b"foo"
+    assert list(tmp_path.iterdir()) == [path]
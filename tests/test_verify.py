@@ -1,4 +1,9 @@
-from pytest_approval.main import _verify
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pytest_approval import approval_scope, verify
+from pytest_approval.main import _get_filepaths, _verify
 
 
 def test_verify_auto_approve(approved_path):
@@ -12,3 +17,56 @@ def test_verify_report_suppress(approved_path):
     assert not _verify("Hello World!", extension=".txt", report_suppress=True)
     # Check if created empty file for reporting is deleted afterwards because its empty
     assert not approved_path.exists()
+
+
+def test_verify_fast_path(approved_path, monkeypatch):
+    # Received is not written to disk if it is equal to approved
+    approved_path.write_text("Hello World!\n")
+    monkeypatch.setattr("pytest_approval.main.AUTO_APPROVE", False)
+    monkeypatch.setattr("pytest_approval.main._write", None)
+    assert _verify("Hello World!", extension=".txt")
+
+
+def test_verify_fast_path_report_always(approved_path, fake_process, monkeypatch):
+    approved_path.write_text("Hello World!\n")
+    monkeypatch.setattr("pytest_approval.main.AUTO_APPROVE", False)
+    monkeypatch.delenv("CI", raising=False)
+    fake_process.register_subprocess(["meld", fake_process.any()])
+    assert _verify("Hello World!", extension=".txt", report_always=True)
+    assert fake_process.call_count(["meld", fake_process.any()]) == 1
+
+
+def test_verify_name():
+    assert verify("foo", name="foo")
+    assert verify("bar", name="bar")
+
+
+def test_verify_name_invalid():
+    with pytest.raises(ValueError, match="Invalid name"):
+        verify("foo", name="foo/bar")
+
+
+def test_verify_approval_scope_threads():
+    """File names should not depend on order of calls from threads."""
+
+    def verify_shard(shard: int) -> bool:
+        with approval_scope(f"shard-{shard}"):
+            return verify(f"Shard {shard}") and verify(f"Shard {shard} again")
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert all(executor.map(verify_shard, range(4)))
+
+
+def test_approval_scope_nested():
+    with approval_scope("foo"):
+        with approval_scope("bar"):
+            received, approved = _get_filepaths(".txt", name="baz")
+        received_2, _ = _get_filepaths(".txt")
+    assert received.name.endswith(".foo.bar.baz.received.txt")
+    assert approved.name.endswith(".foo.bar.baz.approved.txt")
+    assert received_2.name.endswith(".foo.received.txt")
+
+
+def test_verify_tolerance():
+    """Approved has been written on another machine."""
+    assert verify("area: 12.499999999999998\ncount: 3\n", tolerance=1e-9)
@@ -0,0 +1,25 @@
+import asyncio
+
+from pytest_approval import verify_async, verify_json_async
+
+
+def test_verify_async():
+    async def verify_all() -> list[bool]:
+        return await asyncio.gather(*(verify_async(f"Task {i}") for i in range(3)))
+
+    # File names are numbered in order of calls, not in order of completion
+    assert all(asyncio.run(verify_all()))
+
+
+def test_verify_json_async():
+    assert asyncio.run(verify_json_async({"b": 1, "a": [2, 1]}, sort=True))
+
+
+def test_verify_async_reporter(approved_path, fake_process, monkeypatch):
+    """Reporter should be run as asyncio subprocess."""
+    approved_path.write_text("hello world")
+    monkeypatch.setattr("pytest_approval.main.AUTO_APPROVE", False)
+    monkeypatch.delenv("CI", raising=False)
+    fake_process.register_subprocess(["meld", fake_process.any()])
+    assert not asyncio.run(verify_async("Hello World!"))
+    assert fake_process.call_count(["meld", fake_process.any()]) == 1
@@ -32,3 +32,58 @@ def test_verify_json_scrub():
     j = {"date": d}
     scrub_datetime = scrub.get_datetime_scrubber(d)
     assert verify_json(j, sort=True, scrub=scrub_datetime)
+
+
+def test_verify_json_structural():
+    # Approved differs in formatting and key order
+    assert verify_json({"a": None, "b": {"c": [1, 2], "d": 1.0}}, structural=True)
+
+
+def test_verify_json_structural_ci(monkeypatch, capsys: pytest.CaptureFixture):
+    monkeypatch.setenv("CI", "true")
+    monkeypatch.setattr("pytest_approval.main.AUTO_APPROVE", False)
+    assert not verify_json({"a": 1, "b": [1, 2]}, structural=True)
+    stdout, _ = capsys.readouterr()
+    assert stdout.endswith(
+        "--- received\n+++ approved\n/a: 1 -> 2\n/b/1: 2 -> (missing)\n\n"
+    )
+
+
+def test_verify_json_tolerance():
+    """Approved has been written on another machine."""
+    assert verify_json({"a": [0.1 + 0.2, 1], "b": "0.3"}, tolerance=1e-9)
+
+
+def test_verify_json_structural_tolerance():
+    # Approved differs in formatting, key order and in the 16th decimal
+    assert verify_json({"b": 0.1 + 0.2, "a": 1}, structural=True, tolerance=1e-9)
+
+
+def test_verify_json_sort_nested():
+    """Keys of objects nested in arrays are sorted as well."""
+    assert verify_json({"b": [{"d": 1, "c": 2}], "a": 1}, sort=True)
+
+
+def test_verify_json_sort_does_not_modify_data():
+    data = [{"b": 1}, {"a": 1}]
+    assert verify_json(data, sort=True)
+    assert data == [{"b": 1}, {"a": 1}]
+
+
+def test_verify_json_sort_arrays():
+    assert verify_json({"a": [3, 1, 2], "b": {"c", "d"}}, sort_arrays=True)
+
+
+def test_verify_json_precision():
+    assert verify_json({"a": 0.1 + 0.2}, precision=3)
+
+
+def test_verify_json_scrub_paths():
+    data = {
+        "items": [{"id": 1542, "name": "a"}, {"id": 1543, "name": "b"}],
+        "meta": {"created_at": "2024-05-13T16:30:00+02:00"},
+    }
+    scrubber = scrub.get_datetime_scrubber("2024-01-01T00:00:00+00:00")
+    assert verify_json(
+        data, scrub_paths={"$.items[*].id": "{{ID}}", "$..created_at": scrubber}
+    )
@@ -1,10 +1,11 @@
 import os
+from pathlib import Path
 
 import plotly.graph_objects as go
 import pytest
 from pytest_nodeid_to_filepath import get_filepath
 
-from pytest_approval import verify, verify_plotly
+from pytest_approval import main, verify, verify_plotly
 from pytest_approval.definitions import REPORTERS
 
 FIG = go.Figure(
@@ -83,3 +84,25 @@ def test_verify_plotly_two_calls_to_verify(monkeypatch):
 
     assert not filepath.with_suffix(filepath.suffix + ".approved.json").exists()
     assert filepath.with_suffix(filepath.suffix + ".received.json").exists()
+
+
+def test_verify_plotly_deferred(monkeypatch):
+    """Images are reported immediately, because they are removed afterwards."""
+    monkeypatch.setattr("pytest_approval.main.REPORT_DEFERRED", True)
+    monkeypatch.setattr("pytest_approval.main.DEFERRED_REPORTS", [])
+    monkeypatch.setattr("pytest_approval.main.REPORTERS", {"diff": REPORTERS["diff"]})
+    monkeypatch.delenv("CI", raising=False)
+    # Exporting images does not depend on a browser
+    image = Path(
+        "tests/approvals/test_verify_image.py--test_verify_image_bytes[.png].approved.png"
+    ).read_bytes()
+    monkeypatch.setattr(go.Figure, "to_image", lambda *_, **__: image)
+    filepath = get_filepath(directory="tests/approvals", count=False)
+
+    assert not verify_plotly(FIG)
+    assert main.DEFERRED_REPORTS == []
+    main.report_deferred()
+
+    assert not filepath.with_suffix(filepath.suffix + ".approved.png").exists()
+    assert not filepath.with_suffix(filepath.suffix + ".received.png").exists()
+    assert not filepath.with_suffix(filepath.suffix + ".approved.json").exists()
@@ -0,0 +1,63 @@
+from io import StringIO
+
+import pytest
+
+from pytest_approval import scrub, verify_stream
+from pytest_approval.main import _iter_lines
+
+
+def generate_lines():
+    for i in range(1000):
+        yield f"line {i}\n"
+
+
+@pytest.mark.parametrize(
+    ("chunks", "expected"),
+    (
+        ((), ["\n"]),
+        (("",), ["\n"]),
+        (("foo",), ["foo\n"]),
+        (("foo\n",), ["foo\n"]),
+        (("foo\nba", "r\n", "baz"), ["foo\n", "bar\n", "baz\n"]),
+        (("foo\r", "\nbar"), ["foo\r\n", "bar\n"]),
+        (StringIO("foo\nbar"), ["foo\n", "bar\n"]),
+    ),
+)
+def test_iter_lines(chunks, expected):
+    assert list(_iter_lines(chunks)) == expected
+
+
+def test_verify_stream_generator():
+    assert verify_stream(generate_lines())
+
+
+def test_verify_stream_file():
+    assert verify_stream(StringIO("foo\nbar\nbaz"))
+
+
+def test_verify_stream_scrub():
+    chunks = ("2021-01-01 ", "and 27de4925-c261-4e8f-973d-74213004b27d\n", "foo")
+    assert verify_stream(
+        chunks,
+        scrub=(scrub.get_uuid_scrubber(), scrub.get_datetime_scrubber("2020-02-02")),
+    )
+
+
+def test_verify_stream_approved_different(approved_path, fake_process, monkeypatch):
+    approved_path.write_text("foo\nbar\n")
+    monkeypatch.setattr("pytest_approval.main.AUTO_APPROVE", False)
+    monkeypatch.delenv("CI", raising=False)
+    fake_process.register_subprocess(["meld", fake_process.any()])
+    received_path = approved_path.with_name(
+        approved_path.name.replace(".approved", ".received")
+    )
+    assert not verify_stream(iter(["foo\n", "baz\n"]))
+    assert fake_process.call_count(["meld", fake_process.any()]) == 1
+    assert received_path.read_text() == "foo\nbaz\n"
+    received_path.unlink()
+
+
+def test_verify_stream_approved_equal(approved_path, monkeypatch):
+    approved_path.write_bytes(b"foo\r\nbar\n")
+    monkeypatch.setattr("pytest_approval.main.AUTO_APPROVE", False)
+    assert verify_stream(iter(["foo\n", "bar"]))